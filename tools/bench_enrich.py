@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""Benchmarks for the enrichment tooling (table memory, per-row enrichment cost)."""
+from __future__ import annotations
+
+import argparse
+import csv
+import gc
+import gzip
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from enrich_missing_vocab import (
+    CEFR_BAND_LABELS,
+    POS_ALIASES,
+    canonical_pos,
+    enrich_rows,
+    load_pos_lookup,
+    load_reference_files,
+    normalize_word,
+    strip_accents,
+)
+
+
+SYLLABLES = ["ca", "sa", "me", "lo", "ti", "ran", "ción", "dad", "mos", "pe", "rí", "bu", "ña", "go"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the enrichment tooling.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    memory = subparsers.add_parser(
+        "memory", help="Compare retained memory of the reference/POS tables against plain-string layouts."
+    )
+    memory.add_argument("--words", type=int, default=200_000, help="Synthetic corpus size (default: 200000).")
+    memory.add_argument("--seed", type=int, default=7, help="Random seed for the synthetic corpus.")
+    suggestions = subparsers.add_parser(
+        "suggestions", help="Time enrich_rows() with and without --include-suggestions."
+    )
+    suggestions.add_argument("--rows", type=int, default=100_000, help="Input rows (default: 100000).")
+    suggestions.add_argument("--repeat", type=int, default=3, help="Best-of-N timing (default: 3).")
+    suggestions.add_argument("--seed", type=int, default=7, help="Random seed for the synthetic corpus.")
+    return parser.parse_args()
+
+
+def synthetic_words(count: int, rng: random.Random) -> List[str]:
+    words: Dict[str, None] = {}
+    while len(words) < count:
+        words["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))] = None
+    return list(words)
+
+
+def write_reference_tsv(path: Path, words: List[str], rng: random.Random) -> None:
+    pos_values = list(POS_ALIASES)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle, delimiter="\t")
+        writer.writerow(["word", "pos", "cefr", "tags"])
+        for word in words:
+            writer.writerow([word, rng.choice(pos_values), rng.choice(CEFR_BAND_LABELS), ""])
+
+
+def write_pos_dump(path: Path, words: List[str], rng: random.Random) -> None:
+    pos_values = list(POS_ALIASES)
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        for word in words:
+            for _ in range(rng.randint(1, 3)):
+                handle.write(json.dumps({"word": word, "pos": rng.choice(pos_values), "lang_code": "es"}) + "\n")
+
+
+@dataclass
+class PlainReferenceEntry:
+    spanish: str
+    pos: str
+    cefr: str
+    tags: str
+
+
+def load_plain_reference(path: Path) -> Dict[str, PlainReferenceEntry]:
+    """String-valued layout equivalent to the interned ReferenceEntry table."""
+    reference: Dict[str, PlainReferenceEntry] = {}
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle, delimiter="\t")
+        next(reader)
+        for word, pos, cefr, tags in reader:
+            reference.setdefault(normalize_word(word), PlainReferenceEntry(word, pos, cefr, tags))
+    return reference
+
+
+def load_plain_pos_lookup(path: Path) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """String-valued layout equivalent to PosLookup, tallied with a Counter per key."""
+    exact_counts: Dict[str, Counter] = defaultdict(Counter)
+    accentless_counts: Dict[str, Counter] = defaultdict(Counter)
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        for line in handle:
+            entry = json.loads(line)
+            key = normalize_word(entry["word"])
+            pos = canonical_pos(entry["pos"])
+            exact_counts[key][pos] += 1
+            accentless_counts[strip_accents(key)][pos] += 1
+    exact = {key: counts.most_common(1)[0][0] for key, counts in exact_counts.items()}
+    accentless = {key: counts.most_common(1)[0][0] for key, counts in accentless_counts.items()}
+    return exact, accentless
+
+
+def measure(label: str, build: Callable[[], object]) -> Tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28} retained {retained / 1_048_576:8.1f} MiB   peak {peak / 1_048_576:8.1f} MiB")
+    del result
+    return retained, peak
+
+
+def report_reduction(plain: Tuple[int, int], interned: Tuple[int, int]) -> None:
+    retained = 100 * (1 - interned[0] / plain[0])
+    peak = 100 * (1 - interned[1] / plain[1])
+    print(f"  reduction: retained {retained:.0f}%, peak {peak:.0f}%")
+
+
+def run_memory(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    words = synthetic_words(args.words, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        ref_path = Path(tmp) / "reference.tsv"
+        pos_path = Path(tmp) / "pos.jsonl.gz"
+        write_reference_tsv(ref_path, words, rng)
+        write_pos_dump(pos_path, words, rng)
+
+        print(f"Reference table ({len(words)} words)")
+        plain = measure("plain strings", lambda: load_plain_reference(ref_path))
+        interned = measure("slotted + interned codes", lambda: load_reference_files([ref_path]))
+        report_reduction(plain, interned)
+
+        print(f"POS lookup ({len(words)} words)")
+        plain = measure("plain strings", lambda: load_plain_pos_lookup(pos_path))
+        interned = measure("interned codes", lambda: load_pos_lookup(pos_path))
+        report_reduction(plain, interned)
+
+
+def best_time(run: Callable[[], object], repeat: int) -> float:
+    """Best wall time over ``repeat`` runs with the cyclic GC paused (as ``timeit`` does)."""
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def run_suggestions(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    words = synthetic_words(args.rows, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        ref_path = Path(tmp) / "reference.tsv"
+        pos_path = Path(tmp) / "pos.jsonl.gz"
+        write_reference_tsv(ref_path, words[: len(words) // 2], rng)
+        write_pos_dump(pos_path, words[::3], rng)
+        reference = load_reference_files([ref_path])
+        pos_lookup = load_pos_lookup(pos_path)
+    freq_map = {normalize_word(word): rank for rank, word in enumerate(words[::2], start=1)}
+    header = ["word", "definition", "pos"]
+    rows = [[word, rng.choice(["to run", "house", ""]), rng.choice(["", "noun", "Adjective"])] for word in words]
+
+    print(f"enrich_rows() over {len(rows)} rows (best of {args.repeat})")
+    plain = best_time(lambda: enrich_rows(rows, header, reference, freq_map, pos_lookup, False), args.repeat)
+    print(f"  without suggestions  {plain:7.3f} s   {len(rows) / plain:10.0f} rows/s")
+    with_suggestions = best_time(
+        lambda: enrich_rows(rows, header, reference, freq_map, pos_lookup, True), args.repeat
+    )
+    print(f"  with suggestions     {with_suggestions:7.3f} s   {len(rows) / with_suggestions:10.0f} rows/s")
+    print(f"  suggestion overhead: {100 * (with_suggestions / plain - 1):+.1f}%")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "memory":
+        run_memory(args)
+    elif args.command == "suggestions":
+        run_suggestions(args)
+
+
+if __name__ == "__main__":
+    main()
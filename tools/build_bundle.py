@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Compile words.tsv into a compact, content-hashed JSON bundle plus a small manifest."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from search_index import build_search_index
+
+
+DEFAULT_SOURCE = Path("public") / "data" / "words.tsv"
+BUNDLE_VERSION = 2
+HASH_LENGTH = 12
+TAG_SPLIT_RE = re.compile(r"[|,;]+|\s+")
+LINE_SPLIT_RE = re.compile(r"\r?\n")
+
+# Header aliases mirror parseTSV() in src/data/words.ts.
+HEADER_PATTERNS = {
+    "word": re.compile(r"^(word|spanish)$", re.IGNORECASE),
+    "definition": re.compile(r"^(definition|english)$", re.IGNORECASE),
+    "POS": re.compile(r"^pos$", re.IGNORECASE),
+    "CEFR": re.compile(r"^cefr$", re.IGNORECASE),
+    "Tags": re.compile(r"^tags?$", re.IGNORECASE),
+}
+
+
+class InternTable:
+    """Assigns each distinct string a stable index in first-seen order."""
+
+    __slots__ = ("values", "index")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        idx = self.index.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self.values.append(value)
+            self.index[value] = idx
+        return idx
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compile words.tsv into a content-hashed bundle the web app can cache forever."
+    )
+    parser.add_argument(
+        "--source",
+        type=Path,
+        default=DEFAULT_SOURCE,
+        help=f"Canonical TSV to compile (default: {DEFAULT_SOURCE}).",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        help="Directory for the bundle and manifest (defaults to the source file's directory).",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete older <stem>.<hash>.json bundles and search indexes from the output directory.",
+    )
+    parser.add_argument(
+        "--substring-index",
+        action="store_true",
+        help="Index every character offset so search_index.py --contains works (several times larger).",
+    )
+    return parser.parse_args()
+
+
+def parse_tsv(text: str) -> List[List[str]]:
+    """Split records exactly like parseTSV() in src/data/words.ts.
+
+    Lines end at ``\r?\n`` and cells at tabs, with no quote handling. Blank
+    lines are dropped before the first remaining line is taken as the header.
+    """
+    if text.startswith("\ufeff"):
+        text = text[1:]  # fetch()'s UTF-8 decoding drops the BOM too
+    return [line.split("\t") for line in LINE_SPLIT_RE.split(text) if line.strip()]
+
+
+def column_indices(header: Sequence[str]) -> Dict[str, Optional[int]]:
+    cleaned = [value.strip().lstrip("\ufeff") for value in header]
+    indices: Dict[str, Optional[int]] = {}
+    for name, pattern in HEADER_PATTERNS.items():
+        indices[name] = next((idx for idx, value in enumerate(cleaned) if pattern.match(value)), None)
+    return indices
+
+
+def split_tags(value: str) -> List[str]:
+    return [tag for tag in TAG_SPLIT_RE.split(value.strip()) if tag]
+
+
+def build_bundle(records: Sequence[Sequence[str]]) -> Dict[str, object]:
+    """Return the bundle payload: interned POS/CEFR/tag tables plus columnar rows.
+
+    ``columns.pos``/``columns.cefr`` hold indexes into ``tables.pos``/``tables.cefr``;
+    ``columns.tags`` holds, per row, the distinct indexes into ``tables.tags`` in cell order.
+    Cells are trimmed and rows whose cells are all blank are dropped, matching
+    the TSV loader.
+    """
+    if not records:
+        header: Sequence[str] = []
+        body: Sequence[Sequence[str]] = []
+    else:
+        header, body = records[0], records[1:]
+    indices = column_indices(header)
+    pos_table = InternTable()
+    cefr_table = InternTable()
+    tag_table = InternTable()
+    pos_table.intern("")
+    cefr_table.intern("")
+
+    def cell(row: Sequence[str], name: str) -> str:
+        idx = indices[name]
+        return row[idx].strip() if idx is not None and idx < len(row) else ""
+
+    words: List[str] = []
+    definitions: List[str] = []
+    pos_codes: List[int] = []
+    cefr_codes: List[int] = []
+    tag_lists: List[List[int]] = []
+    for row in body:
+        if all(not value.strip() for value in row):
+            continue
+        words.append(cell(row, "word"))
+        definitions.append(cell(row, "definition"))
+        pos_codes.append(pos_table.intern(cell(row, "POS")))
+        cefr_codes.append(cefr_table.intern(cell(row, "CEFR")))
+        tag_lists.append(list(dict.fromkeys(tag_table.intern(tag) for tag in split_tags(cell(row, "Tags")))))
+    return {
+        "version": BUNDLE_VERSION,
+        "rows": len(words),
+        "tables": {"pos": pos_table.values, "cefr": cefr_table.values, "tags": tag_table.values},
+        "columns": {
+            "word": words,
+            "definition": definitions,
+            "pos": pos_codes,
+            "cefr": cefr_codes,
+            "tags": tag_lists,
+        },
+    }
+
+
+def encode_json(payload: object) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_hashed(path: Path, payload: bytes, digest: str) -> None:
+    """Write a cache-forever file atomically, keeping an existing copy only if its contents match."""
+    if path.is_file() and path.stat().st_size == len(payload):
+        if hashlib.sha256(path.read_bytes()).hexdigest() == digest:
+            return
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(payload)
+    tmp_path.replace(path)
+
+
+def write_bundle(source: Path, out_dir: Path, *, prune: bool, substring: bool = False) -> Dict[str, object]:
+    source_bytes = source.read_bytes()
+    records = parse_tsv(source_bytes.decode("utf-8"))
+    bundle = build_bundle(records)
+    bundle_bytes = encode_json(bundle)
+    digest = hashlib.sha256(bundle_bytes).hexdigest()
+    bundle_name = f"{source.stem}.{digest[:HASH_LENGTH]}.json"
+
+    columns = bundle["columns"]
+    search = build_search_index(columns["word"], columns["definition"], substring=substring)  # type: ignore[index]
+    search_bytes = encode_json(search)
+    search_digest = hashlib.sha256(search_bytes).hexdigest()
+    search_name = f"{source.stem}.search.{search_digest[:HASH_LENGTH]}.json"
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    write_hashed(out_dir / bundle_name, bundle_bytes, digest)
+    write_hashed(out_dir / search_name, search_bytes, search_digest)
+
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "bundle": bundle_name,
+        "sha256": digest,
+        "bytes": len(bundle_bytes),
+        "rows": bundle["rows"],
+        "search": search_name,
+        "search_sha256": search_digest,
+        "search_bytes": len(search_bytes),
+        "source": source.name,
+        "source_sha256": hashlib.sha256(source_bytes).hexdigest(),
+    }
+    manifest_path = out_dir / f"{source.stem}.manifest.json"
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(manifest_path)
+
+    if prune:
+        pattern = re.compile(rf"^{re.escape(source.stem)}\.(search\.)?[0-9a-f]{{{HASH_LENGTH}}}\.json$")
+        for candidate in out_dir.iterdir():
+            if candidate.name not in (bundle_name, search_name) and pattern.match(candidate.name):
+                candidate.unlink()
+    return manifest
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.source.is_file():
+        sys.exit(f"TSV file not found: {args.source}")
+    out_dir = args.out_dir or args.source.parent
+    manifest = write_bundle(args.source, out_dir, prune=args.prune, substring=args.substring_index)
+    print(f"Bundle:   {out_dir / str(manifest['bundle'])} ({manifest['rows']} rows, {manifest['bytes']} bytes)")
+    print(f"Search:   {out_dir / str(manifest['search'])} ({manifest['search_bytes']} bytes)")
+    print(f"Manifest: {out_dir / (args.source.stem + '.manifest.json')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,20 @@ from __future__ import annotations
 import argparse
 import csv
 import datetime as dt
+import itertools
 import re
 import string
 import sys
+import time
 import unicodedata
 from dataclasses import dataclass
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
-from typing import Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from external_sort import ExternalSorter, parse_size
+from vocab_io import map_table_rows, source_signature
 
 
 DEFAULT_DATA_DIR = Path("data")
@@ -38,13 +45,27 @@ def parse_args() -> argparse.Namespace:
         "--mine",
         type=Path,
         default=Path("data") / "words.tsv",
-        help="Path to the TSV file treated as canonical (default: data/words.tsv).",
+        help=(
+            "Path to the TSV file (or sharded dataset manifest/directory) treated as "
+            "canonical (default: data/words.tsv)."
+        ),
+    )
+    parser.add_argument(
+        "--mine-db",
+        type=Path,
+        help=(
+            "SQLite database built by vocab_db.py. When given, membership is checked "
+            "with indexed queries against its words table instead of re-reading --mine."
+        ),
     )
     parser.add_argument(
         "--other",
         type=Path,
         required=True,
-        help="Path to the TSV file whose words should exist in --mine.",
+        help=(
+            "Path to the TSV or XLSX file (book.xlsx or book.xlsx#Sheet) whose words "
+            "should exist in --mine."
+        ),
     )
     parser.add_argument(
         "--output",
@@ -76,8 +97,44 @@ def parse_args() -> argparse.Namespace:
         action="store_false",
         help="Disable printing the summary block (default: summary is shown).",
     )
+    parser.add_argument(
+        "--memory-budget",
+        type=memory_budget,
+        help=(
+            "Compare out of core: sort both files in runs of at most this size (e.g. 512M, 2G) "
+            "in temp files and merge them instead of holding every word in memory."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "After the first comparison, keep both files indexed in memory and refresh the "
+            "output whenever --mine or --other changes (Ctrl+C to stop)."
+        ),
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between change checks in --watch mode (default: 1.0).",
+    )
     parser.set_defaults(strip_punct=True, summary=True)
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.memory_budget and args.mine_db:
+        parser.error("--memory-budget cannot be combined with --mine-db")
+    if args.watch and (args.memory_budget or args.mine_db):
+        parser.error("--watch keeps both files in memory and cannot be combined with --memory-budget or --mine-db")
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    return args
+
+
+def memory_budget(value: str) -> int:
+    try:
+        return parse_size(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
 
 
 def sanitize_word(
@@ -94,35 +151,77 @@ def sanitize_word(
     return text
 
 
+def normalize_rows(
+    rows: List[List[str]], *, ignore_accents: bool, strip_punct: bool, keep_rows: bool
+) -> List[Tuple[str, List[str] | None]]:
+    """Pair each row with its normalized word ("" when blank); runs in tsv_reader workers."""
+    keyed: List[Tuple[str, List[str] | None]] = []
+    for row in rows:
+        if not row or not row[0].strip():
+            normalized = ""
+        else:
+            normalized = sanitize_word(row[0], ignore_accents=ignore_accents, strip_punct=strip_punct)
+        keyed.append((normalized, row if keep_rows else None))
+    return keyed
+
+
+def iter_word_rows(
+    path: Path,
+    stats: LoadStats,
+    *,
+    ignore_accents: bool,
+    strip_punct: bool,
+    header: List[str] | None = None,
+    keep_rows: bool = True,
+    memory_cap: int | None = None,
+) -> Iterator[Tuple[str, Sequence[str]]]:
+    """Yield ``(normalized, row)`` for each usable data row, counting the rest in ``stats``.
+
+    The header row is skipped (and copied into ``header`` when a list is given);
+    blank words and words that normalize to nothing count as malformed.
+    Duplicate handling is left to the caller. With ``keep_rows=False`` the
+    row comes back as ``None``, which spares large parallel reads from
+    shipping every row back from the worker processes. A missing or
+    unreadable file (bad UTF-8, broken workbook) raises ValueError naming it.
+    ``memory_cap`` bounds the parsed rows the reader buffers ahead of this loop.
+    """
+    transform = partial(
+        normalize_rows,
+        ignore_accents=ignore_accents,
+        strip_punct=strip_punct,
+        keep_rows=keep_rows or header is not None,
+    )
+    try:
+        for idx, (normalized, row) in enumerate(map_table_rows(path, transform, memory_cap=memory_cap)):
+            stats.rows_read += 1
+            if idx == 0:
+                if header is not None:
+                    header.extend(row)
+                stats.header_skipped = True
+                continue
+            if not normalized:
+                stats.malformed_rows += 1
+                continue
+            yield normalized, row
+    except FileNotFoundError as exc:
+        raise ValueError(f"File not found: {path}") from exc
+    except ValueError as exc:
+        raise ValueError(f"Cannot read {path}: {exc}") from exc
+
+
 def load_word_set(
     path: Path, *, ignore_accents: bool, strip_punct: bool
 ) -> Tuple[set[str], LoadStats]:
     stats = LoadStats()
     words: set[str] = set()
 
-    try:
-        with path.open("r", encoding="utf-8", newline="") as handle:
-            reader = csv.reader(handle, dialect="excel-tab")
-            for idx, row in enumerate(reader):
-                stats.rows_read += 1
-                if idx == 0:
-                    stats.header_skipped = True
-                    continue
-                if not row or not row[0].strip():
-                    stats.malformed_rows += 1
-                    continue
-                normalized = sanitize_word(
-                    row[0], ignore_accents=ignore_accents, strip_punct=strip_punct
-                )
-                if not normalized:
-                    stats.malformed_rows += 1
-                    continue
-                if normalized in words:
-                    stats.duplicates += 1
-                    continue
-                words.add(normalized)
-    except FileNotFoundError:
-        sys.exit(f"File not found: {path}")
+    for normalized, _ in iter_word_rows(
+        path, stats, ignore_accents=ignore_accents, strip_punct=strip_punct, keep_rows=False
+    ):
+        if normalized in words:
+            stats.duplicates += 1
+            continue
+        words.add(normalized)
 
     stats.unique_words = len(words)
     return words, stats
@@ -145,40 +244,274 @@ def load_other_file(
     stats = LoadStats()
     rows: List[Tuple[str, Sequence[str]]] = []
     seen: set[str] = set()
-    header: Sequence[str] = []
+    header: List[str] = []
+
+    for normalized, row in iter_word_rows(
+        path, stats, ignore_accents=ignore_accents, strip_punct=strip_punct, header=header
+    ):
+        if normalized in seen:
+            stats.duplicates += 1
+            if not keep_duplicates:
+                continue
+        else:
+            seen.add(normalized)
+
+        rows.append((normalized, row))
+
+    stats.unique_words = len(seen)
+    return OtherFileData(rows=rows, header=header, stats=stats)
+
 
+def load_mine_from_db(
+    path: Path, keys: Iterable[str], *, ignore_accents: bool, strip_punct: bool
+) -> Tuple[set[str], LoadStats]:
+    """Return the subset of ``keys`` present in the database words table plus its stats."""
+    import vocab_db
+
+    if not strip_punct:
+        sys.exit("--mine-db keys are stored with punctuation stripped; drop --keep-punctuation.")
+    conn = vocab_db.connect(path)
     try:
-        with path.open("r", encoding="utf-8", newline="") as handle:
-            reader = csv.reader(handle, dialect="excel-tab")
-            for idx, row in enumerate(reader):
-                stats.rows_read += 1
-                if idx == 0:
-                    header = row
-                    stats.header_skipped = True
-                    continue
-                if not row or not row[0].strip():
-                    stats.malformed_rows += 1
-                    continue
-                normalized = sanitize_word(
-                    row[0], ignore_accents=ignore_accents, strip_punct=strip_punct
+        vocab_db.require_words(conn)
+        present = vocab_db.present_words(conn, keys, ignore_accents=ignore_accents)
+        rows, unique, malformed = vocab_db.word_counts(conn, ignore_accents=ignore_accents)
+    finally:
+        conn.close()
+    stats = LoadStats(
+        rows_read=rows + 1,
+        header_skipped=True,
+        malformed_rows=malformed,
+        duplicates=rows - malformed - unique,
+        unique_words=unique,
+    )
+    return present, stats
+
+
+def count_groups(keys: Iterable[str], stats: LoadStats) -> Iterator[str]:
+    """Collapse sorted ``keys`` to unique values, tallying unique/duplicate counts in ``stats``."""
+    for key, group in itertools.groupby(keys):
+        stats.unique_words += 1
+        stats.duplicates += sum(1 for _ in group) - 1
+        yield key
+
+
+@dataclass
+class ExternalComparison:
+    mine_stats: LoadStats
+    other_stats: LoadStats
+    missing_rows: int
+
+
+def compare_external(
+    mine: Path,
+    other: Path,
+    target: Path,
+    *,
+    ignore_accents: bool,
+    strip_punct: bool,
+    keep_duplicates: bool,
+    memory_budget: int,
+) -> ExternalComparison:
+    """Sort/merge variant of load_word_set() + load_other_file() for files larger than RAM.
+
+    Mine keys and ``(normalized, seq, row)`` records from the other file are
+    sorted in bounded runs, then walked together in one merge-join: each
+    group of equal keys gives the duplicate counts, and the surviving rows
+    missing from mine are sorted back into file order by ``seq`` before
+    being written. Output and stats match the in-memory path.
+    """
+    mine_stats = LoadStats()
+    other_stats = LoadStats()
+    header: List[str] = []
+    # Three sorters and the reader's read-ahead are live at once; each gets a quarter of the budget.
+    share = max(memory_budget // 4, 1)
+
+    with ExternalSorter(share) as mine_sorter, ExternalSorter(share) as other_sorter, ExternalSorter(
+        share
+    ) as missing_sorter:
+        other_sorter.extend(
+            (normalized, seq, row)
+            for seq, (normalized, row) in enumerate(
+                iter_word_rows(
+                    other,
+                    other_stats,
+                    ignore_accents=ignore_accents,
+                    strip_punct=strip_punct,
+                    header=header,
+                    memory_cap=share,
                 )
-                if not normalized:
-                    stats.malformed_rows += 1
-                    continue
+            )
+        )
+        mine_sorter.extend(
+            normalized
+            for normalized, _ in iter_word_rows(
+                mine,
+                mine_stats,
+                ignore_accents=ignore_accents,
+                strip_punct=strip_punct,
+                keep_rows=False,
+                memory_cap=share,
+            )
+        )
 
-                if normalized in seen:
-                    stats.duplicates += 1
-                    if not keep_duplicates:
-                        continue
-                else:
-                    seen.add(normalized)
+        mine_keys = count_groups(mine_sorter.sorted(), mine_stats)
+        mine_key = next(mine_keys, None)
+        for normalized, group in itertools.groupby(other_sorter.sorted(), key=itemgetter(0)):
+            other_stats.unique_words += 1
+            while mine_key is not None and mine_key < normalized:
+                mine_key = next(mine_keys, None)
+            present = mine_key == normalized
+            for idx, (_, seq, row) in enumerate(group):
+                if idx:
+                    other_stats.duplicates += 1
+                if not present and (idx == 0 or keep_duplicates):
+                    missing_sorter.add((seq, row))
+        for _ in mine_keys:
+            pass  # drain the rest so mine_stats covers the whole file
+
+        missing = 0
+
+        def missing_rows() -> Iterator[Sequence[str]]:
+            nonlocal missing
+            for _, row in missing_sorter.sorted():
+                missing += 1
+                yield row
+
+        write_rows(target, header, missing_rows())
+
+    return ExternalComparison(
+        mine_stats=mine_stats, other_stats=other_stats, missing_rows=missing
+    )
 
-                rows.append((normalized, row))
-    except FileNotFoundError:
-        sys.exit(f"File not found: {path}")
 
-    stats.unique_words = len(seen)
-    return OtherFileData(rows=rows, header=header, stats=stats)
+@dataclass
+class WatchState:
+    """In-memory indexes kept between refreshes in --watch mode."""
+
+    mine_words: set[str]
+    other: OtherFileData
+    # normalized word -> positions in other.rows
+    other_index: Dict[str, List[int]]
+    # positions in other.rows whose word is not in mine_words
+    missing: set[int]
+
+
+def index_other_rows(rows: Sequence[Tuple[str, Sequence[str]]]) -> Dict[str, List[int]]:
+    index: Dict[str, List[int]] = {}
+    for pos, (normalized, _) in enumerate(rows):
+        index.setdefault(normalized, []).append(pos)
+    return index
+
+
+def build_watch_state(mine_words: set[str], other: OtherFileData) -> WatchState:
+    index = index_other_rows(other.rows)
+    missing = {pos for word, positions in index.items() if word not in mine_words for pos in positions}
+    return WatchState(mine_words=mine_words, other=other, other_index=index, missing=missing)
+
+
+def apply_mine_change(state: WatchState, mine_words: set[str]) -> Tuple[List[str], List[str]]:
+    """Swap in a new canonical set, updating only the missing rows its changed words touch.
+
+    Returns the sorted words that entered and left the canonical set.
+    """
+    entered = sorted(mine_words - state.mine_words)
+    left = sorted(state.mine_words - mine_words)
+    for word in entered:
+        state.missing.difference_update(state.other_index.get(word, ()))
+    for word in left:
+        state.missing.update(state.other_index.get(word, ()))
+    state.mine_words = mine_words
+    return entered, left
+
+
+def missing_rows(state: WatchState) -> List[Sequence[str]]:
+    """The current missing rows in --other order."""
+    rows = state.other.rows
+    return [rows[pos][1] for pos in sorted(state.missing)]
+
+
+def write_missing(target: Path, state: WatchState) -> None:
+    """Atomically replace ``target`` with the current missing rows in --other order."""
+    tmp_path = target.with_name(target.name + ".tmp")
+    write_rows(tmp_path, state.other.header, missing_rows(state))
+    tmp_path.replace(target)
+
+
+def output_changed(old: WatchState, new: WatchState) -> bool:
+    """True when ``new`` would write a different output file than ``old``."""
+    if new.other is old.other:
+        return new.missing != old.missing
+    return new.other.header != old.other.header or missing_rows(new) != missing_rows(old)
+
+
+def preview(words: Sequence[str], limit: int = 10) -> str:
+    shown = ", ".join(words[:limit])
+    return shown + (f", … (+{len(words) - limit} more)" if len(words) > limit else "")
+
+
+def watch(args: argparse.Namespace, target: Path, state: WatchState) -> None:
+    """Poll --mine/--other and refresh ``target`` incrementally until interrupted.
+
+    A file that cannot be read (missing, or caught half-written) leaves the
+    previous state in place and is retried on the next tick.
+    """
+    signatures = {"mine": source_signature(args.mine), "other": source_signature(args.other)}
+    failures: Dict[str, str] = {}
+    print(f"Watching {args.mine} and {args.other} (every {args.interval:g}s, Ctrl+C to stop) ...")
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = {"mine": source_signature(args.mine), "other": source_signature(args.other)}
+            pending = [name for name in ("mine", "other") if current[name] and current[name] != signatures[name]]
+            if not pending:
+                continue
+            started = time.perf_counter()
+            previous = WatchState(state.mine_words, state.other, state.other_index, set(state.missing))
+            before = previous.missing
+            changed: List[str] = []
+            notes: List[str] = []
+            for name in pending:
+                try:
+                    if name == "mine":
+                        mine_words, _ = load_word_set(
+                            args.mine, ignore_accents=args.ignore_accents, strip_punct=args.strip_punct
+                        )
+                    else:
+                        other = load_other_file(
+                            args.other,
+                            ignore_accents=args.ignore_accents,
+                            strip_punct=args.strip_punct,
+                            keep_duplicates=args.keep_duplicates,
+                        )
+                except (OSError, ValueError) as exc:
+                    if failures.get(name) != str(exc):
+                        print(f"  {name}: {exc}; keeping the previous state and retrying.")
+                    failures[name] = str(exc)
+                    continue
+                failures.pop(name, None)
+                signatures[name] = current[name]
+                changed.append(name)
+                if name == "mine":
+                    entered, left = apply_mine_change(state, mine_words)
+                    notes.append(f"mine: {len(entered)} entered, {len(left)} left")
+                    if entered:
+                        notes.append(f"  + {preview(entered)}")
+                    if left:
+                        notes.append(f"  - {preview(left)}")
+                else:
+                    state = build_watch_state(state.mine_words, other)
+                    notes.append(f"other: {other.stats.unique_words} unique words")
+            if not changed:
+                continue
+            if output_changed(previous, state):
+                write_missing(target, state)
+            elapsed = (time.perf_counter() - started) * 1000
+            stamp = dt.datetime.now().strftime("%H:%M:%S")
+            print(f"[{stamp}] {' & '.join(changed)} changed; missing rows {len(before)} -> {len(state.missing)} ({elapsed:.0f} ms)")
+            for note in notes:
+                print(f"  {note}")
+    except KeyboardInterrupt:
+        print("Stopped watching.")
 
 
 def ensure_output_path(path: Path | None, other: Path) -> Path:
@@ -208,43 +541,69 @@ def write_rows(
 
 def main() -> None:
     args = parse_args()
+    target_path = ensure_output_path(args.output, args.other)
 
-    mine_words, mine_stats = load_word_set(
-        args.mine, ignore_accents=args.ignore_accents, strip_punct=args.strip_punct
-    )
-
-    other_data = load_other_file(
-        args.other,
-        ignore_accents=args.ignore_accents,
-        strip_punct=args.strip_punct,
-        keep_duplicates=args.keep_duplicates,
-    )
-
-    missing_rows = [
-        row for normalized, row in other_data.rows if normalized not in mine_words
-    ]
+    try:
+        if args.memory_budget:
+            result = compare_external(
+                args.mine,
+                args.other,
+                target_path,
+                ignore_accents=args.ignore_accents,
+                strip_punct=args.strip_punct,
+                keep_duplicates=args.keep_duplicates,
+                memory_budget=args.memory_budget,
+            )
+            mine_stats, other_stats, missing_count = result.mine_stats, result.other_stats, result.missing_rows
+        else:
+            other_data = load_other_file(
+                args.other,
+                ignore_accents=args.ignore_accents,
+                strip_punct=args.strip_punct,
+                keep_duplicates=args.keep_duplicates,
+            )
+
+            if args.mine_db:
+                mine_words, mine_stats = load_mine_from_db(
+                    args.mine_db,
+                    (normalized for normalized, _ in other_data.rows),
+                    ignore_accents=args.ignore_accents,
+                    strip_punct=args.strip_punct,
+                )
+            else:
+                mine_words, mine_stats = load_word_set(
+                    args.mine, ignore_accents=args.ignore_accents, strip_punct=args.strip_punct
+                )
 
-    target_path = ensure_output_path(args.output, args.other)
-    write_rows(target_path, other_data.header, missing_rows)
+            missing_rows = [
+                row for normalized, row in other_data.rows if normalized not in mine_words
+            ]
+            write_rows(target_path, other_data.header, missing_rows)
+            other_stats, missing_count = other_data.stats, len(missing_rows)
+    except ValueError as exc:
+        sys.exit(str(exc))
 
     if args.summary:
         print("Comparison summary")
         print("------------------")
-        print(f"Mine file:        {args.mine}")
+        print(f"Mine file:        {args.mine_db or args.mine}")
         print(f"  Rows read:      {mine_stats.rows_read} (header skipped: {mine_stats.header_skipped})")
         print(f"  Unique words:   {mine_stats.unique_words}")
         print(f"  Duplicates:     {mine_stats.duplicates}")
         print(f"  Malformed rows: {mine_stats.malformed_rows}")
         print()
         print(f"Other file:       {args.other}")
-        print(f"  Rows read:      {other_data.stats.rows_read} (header skipped: {other_data.stats.header_skipped})")
-        print(f"  Unique words:   {other_data.stats.unique_words}")
-        print(f"  Duplicates:     {other_data.stats.duplicates}")
-        print(f"  Malformed rows: {other_data.stats.malformed_rows}")
+        print(f"  Rows read:      {other_stats.rows_read} (header skipped: {other_stats.header_skipped})")
+        print(f"  Unique words:   {other_stats.unique_words}")
+        print(f"  Duplicates:     {other_stats.duplicates}")
+        print(f"  Malformed rows: {other_stats.malformed_rows}")
         print()
-        print(f"Missing rows written: {len(missing_rows)}")
+        print(f"Missing rows written: {missing_count}")
         print(f"Output file:          {target_path}")
 
+    if args.watch:
+        watch(args, target_path, build_watch_state(mine_words, other_data))
+
 
 if __name__ == "__main__":
     main()
@@ -3,22 +3,30 @@
 from __future__ import annotations
 
 import argparse
+import bisect
 import csv
 import gzip
 import json
+import os
 import shutil
 import string
 import sys
 import unicodedata
 import urllib.error
 import urllib.request
-from collections import Counter, defaultdict
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from pos_suffix_model import LazySuffixModel
+from tsv_reader import map_tsv_rows
+from vocab_io import iter_table_rows, source_exists, source_signature
 
 
 DATA_DIR = Path("data")
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_ROWS = 10_000
 VOCAB_DIR = Path("Vocab List Work Files")
 DEFAULT_REFERENCE_ROOT = Path("/mnt/c/Users/jtpol/OneDrive/Temp")
 FREQUENCY_FILENAME = "es_full_frequency.txt"
@@ -29,6 +37,10 @@ FREQUENCY_FILE = DEFAULT_REFERENCE_ROOT / FREQUENCY_FILENAME
 POS_SOURCE_FILENAME = "es-extract.jsonl.gz"
 POS_SOURCE_URL = "https://kaikki.org/dictionary/downloads/es/es-extract.jsonl.gz"
 POS_SOURCE_FILE = DEFAULT_REFERENCE_ROOT / POS_SOURCE_FILENAME
+POS_MODEL_FILENAME = "es_pos_suffix_model.tsv"
+POS_MODEL_FILE = DEFAULT_REFERENCE_ROOT / POS_MODEL_FILENAME
+# Suffix-model predictions below this confidence are left blank for review.
+MIN_SUFFIX_CONFIDENCE = 0.6
 
 POS_ALIASES = {
     "adjective": "adj",
@@ -72,21 +84,116 @@ COLUMN_ALIASES = {
     "tags": {"tags", "tag"},
 }
 
+# Upper frequency rank (inclusive) for each inferred CEFR band.
+CEFR_BANDS: Tuple[Tuple[int, str], ...] = (
+    (500, "A1.1"),
+    (1500, "A1.2"),
+    (3000, "A2.1"),
+    (6000, "A2.2"),
+    (10000, "B1.1"),
+    (15000, "B1.2"),
+    (22000, "B2.1"),
+)
+CEFR_BAND_LIMITS = [limit for limit, _ in CEFR_BANDS]
+CEFR_BAND_LABELS = [label for _, label in CEFR_BANDS] + ["B2.2"]
+CEFR_UNKNOWN = "X"
+
+MERGE_FIELDS = ("pos", "cefr", "tags")
+MERGE_STRATEGIES = ("priority", "majority")
+
 STRIP_CHARS = string.whitespace
 
 
-@dataclass
+class CodeTable:
+    """Interns short categorical strings (POS, CEFR) as small integer codes.
+
+    Code 0 is always the empty string so codes stay falsy exactly when the
+    decoded value would be. Unseen values are appended on first use.
+    """
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self, seed: Iterable[str] = ()) -> None:
+        self.values: List[str] = [""]
+        self.codes: Dict[str, int] = {"": 0}
+        for value in seed:
+            self.encode(value)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def decode(self, code: int) -> str:
+        return self.values[code]
+
+
+class CodeMap:
+    """Read-only ``{key: code}`` table stored as sorted keys plus an array of codes.
+
+    Costs one list slot and one or two bytes per key instead of a dict entry;
+    lookups are a binary search.
+    """
+
+    __slots__ = ("keys", "codes")
+
+    def __init__(self, mapping: Dict[str, int]) -> None:
+        self.keys: List[str] = sorted(mapping)
+        top = max(mapping.values(), default=0)
+        typecode = "B" if top < 1 << 8 else "H" if top < 1 << 16 else "L"
+        self.codes = array(typecode, (mapping[key] for key in self.keys))
+
+    def get(self, key: str, default: int = 0) -> int:
+        idx = bisect.bisect_left(self.keys, key)
+        if idx < len(self.keys) and self.keys[idx] == key:
+            return self.codes[idx]
+        return default
+
+    def items(self) -> Iterator[Tuple[str, int]]:
+        return zip(self.keys, self.codes)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+POS_CODES = CodeTable(dict.fromkeys(POS_ALIASES.values()))
+CEFR_CODES = CodeTable(CEFR_BAND_LABELS + [CEFR_UNKNOWN])
+
+
+def compile_pos_aliases(aliases: Dict[str, str]) -> Dict[str, str]:
+    """Expand the alias table with the case/whitespace variants seen in source files."""
+    table: Dict[str, str] = {}
+    for alias, canonical in aliases.items():
+        for variant in (alias, alias.upper(), alias.title(), alias.capitalize()):
+            for spaced in (variant, f" {variant}", f"{variant} "):
+                table.setdefault(spaced, canonical)
+    return table
+
+
+# Raw POS text -> canonical POS (and its code). Both start from the compiled
+# alias table and memoize any other raw value the first time it is resolved.
+POS_RESOLUTION = compile_pos_aliases(POS_ALIASES)
+POS_CODE_RESOLUTION = {raw: POS_CODES.encode(canonical) for raw, canonical in POS_RESOLUTION.items()}
+
+
+@dataclass(slots=True)
 class ReferenceEntry:
     spanish: str
-    pos: str
-    cefr: str
+    pos: int  # POS_CODES code of the canonical POS
+    cefr: int  # CEFR_CODES code
     tags: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PosLookup:
-    exact: Dict[str, str]
-    accentless: Dict[str, str]
+    # Values are POS_CODES codes, like ReferenceEntry.pos.
+    exact: CodeMap
+    accentless: CodeMap
+    # Fallback for words in neither map; see pos_suffix_model.py.
+    suffix_model: Optional[LazySuffixModel] = None
 
 
 def parse_args() -> argparse.Namespace:
@@ -109,10 +216,26 @@ def parse_args() -> argparse.Namespace:
         type=Path,
         action="append",
         help=(
-            "Additional TSV files to mine for CEFR/POS data. "
-            "Defaults to scanning data/*.tsv and Vocab List Work Files/*.tsv."
+            "Additional TSV/XLSX files (or sharded datasets) to mine for CEFR/POS data. "
+            "Defaults to scanning data/*.tsv and Vocab List Work Files/*.tsv (sorted by name). "
+            "Files are ranked in the order given."
+        ),
+    )
+    parser.add_argument(
+        "--merge-strategy",
+        choices=MERGE_STRATEGIES,
+        default="priority",
+        help=(
+            "How conflicting POS/CEFR/tags across reference files are resolved: "
+            "'priority' takes the first non-blank value in --reference order (default), "
+            "'majority' takes the value most files agree on, ties going to the earlier file."
         ),
     )
+    parser.add_argument(
+        "--conflict-report",
+        type=Path,
+        help="Optional TSV listing every word whose reference files disagree, with the source of each value.",
+    )
     parser.add_argument(
         "--frequency",
         type=Path,
@@ -131,6 +254,41 @@ def parse_args() -> argparse.Namespace:
             "If missing it will be downloaded automatically."
         ),
     )
+    parser.add_argument(
+        "--pos-model",
+        type=Path,
+        default=POS_MODEL_FILE,
+        help=(
+            "Suffix POS model from train_pos_model.py, consulted for words no POS source knows "
+            "(loaded on first use; the built-in ending rules apply if the file is missing)."
+        ),
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        help=(
+            "SQLite database built by vocab_db.py. When given, reference/frequency/POS "
+            "data is pulled from its indexed tables for just the input words instead of "
+            "re-parsing --reference/--frequency/--pos-source."
+        ),
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_ROWS,
+        help=(
+            "Flush the partial output and record a checkpoint every N rows "
+            f"(default: {DEFAULT_CHECKPOINT_ROWS}; 0 disables checkpoints)."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Continue an interrupted run from its last checkpoint (<output>.checkpoint.json), "
+            "skipping rows that were already enriched."
+        ),
+    )
     parser.add_argument(
         "--include-suggestions",
         action="store_true",
@@ -154,71 +312,189 @@ def strip_accents(text: str) -> str:
     return "".join(ch for ch in unicodedata.normalize("NFD", text) if unicodedata.category(ch) != "Mn")
 
 
-def load_reference_files(paths: Iterable[Path]) -> Dict[str, ReferenceEntry]:
-    reference: Dict[str, ReferenceEntry] = {}
+def iter_reference_rows(path: Path) -> Iterator[Tuple[str, str, str, str]]:
+    """Yield ``(word, pos, cefr, tags)`` from a reference TSV (or sharded dataset) with recognizable headers."""
+    reader = iter_table_rows(path, errors="ignore")
+    header = next(reader, None)
+    if not header:
+        return
+    columns = [normalize_header(col) for col in header]
+    indices = {}
+    for desired, aliases in COLUMN_ALIASES.items():
+        for idx, col in enumerate(columns):
+            if col in aliases:
+                indices[desired] = idx
+                break
+    if "spanish" not in indices or "pos" not in indices or "cefr" not in indices:
+        return
+    word_idx, pos_idx, cefr_idx = indices["spanish"], indices["pos"], indices["cefr"]
+    tags_idx = indices.get("tags")
+    for row in reader:
+        if len(row) <= word_idx:
+            continue
+        word = row[word_idx].strip()
+        if not word:
+            continue
+        pos = row[pos_idx].strip() if len(row) > pos_idx else ""
+        cefr = row[cefr_idx].strip() if len(row) > cefr_idx else ""
+        tags = row[tags_idx].strip() if tags_idx is not None and len(row) > tags_idx else ""
+        yield word, pos, cefr, tags
+
+
+@dataclass(slots=True)
+class ReferenceConflict:
+    key: str
+    field: str
+    chosen: str
+    source: str
+    # Every non-blank candidate as (value, source file), in priority order.
+    candidates: List[Tuple[str, str]]
+
+
+@dataclass
+class ReferenceMerge:
+    entries: Dict[str, ReferenceEntry]
+    sources: List[Path]
+    # Per key, the index into ``sources`` that supplied pos/cefr/tags (-1 when blank).
+    provenance: Dict[str, Tuple[int, int, int]]
+    conflicts: List[ReferenceConflict]
+
+
+def pick_candidate(candidates: List[Tuple[int, int]], strategy: str) -> Tuple[int, int]:
+    """Choose one ``(value, source)`` pair from candidates listed in priority order."""
+    if strategy == "majority" and len(candidates) > 1:
+        # One vote per file: a word listed several times in one file counts once.
+        voters: Dict[int, set[int]] = {}
+        for value, source in candidates:
+            voters.setdefault(value, set()).add(source)
+        winner = max(voters, key=lambda value: len(voters[value]))
+        return next(candidate for candidate in candidates if candidate[0] == winner)
+    return candidates[0]
+
+
+def merge_reference_files(paths: Sequence[Path], strategy: str = "priority") -> ReferenceMerge:
+    """Merge reference TSVs field by field, recording provenance and conflicts.
+
+    ``paths`` are in priority order (earlier files win under the ``priority``
+    strategy and break ties under ``majority``). All rows are grouped by
+    normalized word in a single pass, then each group is resolved once.
+    """
+    if strategy not in MERGE_STRATEGIES:
+        raise ValueError(f"Unknown merge strategy: {strategy}")
+    sources: List[Path] = []
+    # key -> list of (source index, spanish, pos code, cefr code, tags) in priority order
+    groups: Dict[str, List[Tuple[int, str, int, int, str]]] = {}
     for path in paths:
-        if not path.is_file():
+        if not source_exists(path):
             continue
+        source_idx = len(sources)
+        sources.append(path)
         try:
-            with path.open("r", encoding="utf-8", errors="ignore", newline="") as handle:
-                reader = csv.reader(handle, delimiter="\t")
-                header = next(reader, None)
-                if not header:
-                    continue
-                columns = [normalize_header(col) for col in header]
-                indices = {}
-                for desired, aliases in COLUMN_ALIASES.items():
-                    for idx, col in enumerate(columns):
-                        if col in aliases:
-                            indices[desired] = idx
-                            break
-                if "spanish" not in indices or "pos" not in indices or "cefr" not in indices:
-                    continue
-                for row in reader:
-                    if not row:
-                        continue
-                    try:
-                        word = row[indices["spanish"]].strip()
-                    except IndexError:
-                        continue
-                    if not word:
-                        continue
-                    key = normalize_word(word)
-                    cefr = row[indices["cefr"]].strip() if indices.get("cefr") is not None else ""
-                    pos = row[indices["pos"]].strip() if indices.get("pos") is not None else ""
-                    tags = ""
-                    if "tags" in indices and len(row) > indices["tags"]:
-                        tags = row[indices["tags"]].strip()
-                    existing = reference.get(key)
-                    if not existing or (not existing.cefr and cefr) or (not existing.tags and tags):
-                        reference[key] = ReferenceEntry(
-                            spanish=word,
-                            pos=pos,
-                            cefr=cefr,
-                            tags=tags,
-                        )
-        except OSError:
+            for word, pos, cefr, tags in iter_reference_rows(path):
+                candidate = (
+                    source_idx,
+                    word,
+                    canonical_pos_code(pos),
+                    CEFR_CODES.encode(cefr),
+                    tags,
+                )
+                key = normalize_word(word)
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [candidate]
+                else:
+                    group.append(candidate)
+        except (OSError, ValueError):
             continue
-    return reference
 
-
-def build_reference_list(args: argparse.Namespace) -> Dict[str, ReferenceEntry]:
+    tag_codes = CodeTable()
+    tables = (POS_CODES, CEFR_CODES, tag_codes)
+    entries: Dict[str, ReferenceEntry] = {}
+    provenance: Dict[str, Tuple[int, int, int]] = {}
+    conflicts: List[ReferenceConflict] = []
+    while groups:
+        key, group = groups.popitem()
+        chosen: List[Tuple[int, int]] = []
+        for field_idx, field in enumerate(MERGE_FIELDS):
+            table = tables[field_idx]
+            candidates = []
+            for candidate in group:
+                value = candidate[2 + field_idx]
+                if field_idx == 2:
+                    value = tag_codes.encode(value)
+                if value:
+                    candidates.append((value, candidate[0]))
+            if not candidates:
+                chosen.append((0, -1))
+                continue
+            pick = pick_candidate(candidates, strategy)
+            chosen.append(pick)
+            if any(value != pick[0] for value, _ in candidates):
+                conflicts.append(
+                    ReferenceConflict(
+                        key=key,
+                        field=field,
+                        chosen=table.decode(pick[0]),
+                        source=str(sources[pick[1]]),
+                        candidates=[(table.decode(value), str(sources[idx])) for value, idx in candidates],
+                    )
+                )
+        (pos, pos_src), (cefr, cefr_src), (tags, tags_src) = chosen
+        entries[key] = ReferenceEntry(
+            spanish=group[0][1],
+            pos=pos,
+            cefr=cefr,
+            tags=tag_codes.decode(tags),
+        )
+        provenance[key] = (pos_src, cefr_src, tags_src)
+    conflicts.sort(key=lambda conflict: (conflict.key, MERGE_FIELDS.index(conflict.field)))
+    return ReferenceMerge(entries=entries, sources=sources, provenance=provenance, conflicts=conflicts)
+
+
+def load_reference_files(paths: Sequence[Path], strategy: str = "priority") -> Dict[str, ReferenceEntry]:
+    return merge_reference_files(paths, strategy).entries
+
+
+def reference_paths(args: argparse.Namespace) -> List[Path]:
     if args.reference:
-        paths = args.reference
+        return args.reference
+    return sorted(DATA_DIR.glob("*.tsv")) + sorted(VOCAB_DIR.glob("*.tsv"))
+
+
+def build_reference_list(args: argparse.Namespace) -> ReferenceMerge:
+    return merge_reference_files(reference_paths(args), args.merge_strategy)
+
+
+def write_conflict_report(merge: ReferenceMerge, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle, delimiter="\t")
+        writer.writerow(["word", "field", "chosen", "chosen_source", "candidates"])
+        for conflict in merge.conflicts:
+            candidates = "; ".join(f"{value} ({source})" for value, source in conflict.candidates)
+            writer.writerow([conflict.key, conflict.field, conflict.chosen, conflict.source, candidates])
+
+
+def tally_code(tallies: Dict[str, Dict[int, int]], key: str, code: int) -> None:
+    counts = tallies.get(key)
+    if counts is None:
+        tallies[key] = {code: 1}
     else:
-        paths = list(DATA_DIR.glob("*.tsv")) + list(VOCAB_DIR.glob("*.tsv"))
-    return load_reference_files(paths)
+        counts[code] = counts.get(code, 0) + 1
 
 
-def choose_most_common(counter_map: Dict[str, Counter]) -> Dict[str, str]:
-    return {key: counts.most_common(1)[0][0] for key, counts in counter_map.items()}
+def choose_most_common(tallies: Dict[str, Dict[int, int]]) -> CodeMap:
+    """Pick the most frequent code per key; ties go to the code seen first."""
+    for key, counts in tallies.items():
+        tallies[key] = max(counts, key=counts.__getitem__)  # type: ignore[assignment]
+    return CodeMap(tallies)  # type: ignore[arg-type]
 
 
 def load_pos_lookup(path: Path) -> PosLookup:
-    exact_counts: Dict[str, Counter] = defaultdict(Counter)
-    accentless_counts: Dict[str, Counter] = defaultdict(Counter)
+    exact_counts: Dict[str, Dict[int, int]] = {}
+    accentless_counts: Dict[str, Dict[int, int]] = {}
     if not path.is_file():
-        return PosLookup(exact={}, accentless={})
+        return PosLookup(exact=CodeMap({}), accentless=CodeMap({}))
 
     opener = gzip.open if path.suffix.endswith(".gz") else open
     try:
@@ -233,20 +509,18 @@ def load_pos_lookup(path: Path) -> PosLookup:
                 if entry.get("lang_code") != "es":
                     continue
                 word = entry.get("word", "").strip()
-                pos = entry.get("pos", "").strip()
-                if not word or not pos:
-                    continue
-                canonical = canonical_pos(pos)
-                if not canonical:
+                code = canonical_pos_code(entry.get("pos", ""))
+                if not word or not code:
                     continue
                 key = normalize_word(word)
                 if not key:
                     continue
                 accentless = strip_accents(key)
-                exact_counts[key][canonical] += 1
-                accentless_counts[accentless][canonical] += 1
+                tally_code(exact_counts, key, code)
+                # Most keys carry no accents; reuse the same string object in both tables.
+                tally_code(accentless_counts, key if accentless == key else accentless, code)
     except OSError:
-        return PosLookup(exact={}, accentless={})
+        return PosLookup(exact=CodeMap({}), accentless=CodeMap({}))
 
     return PosLookup(exact=choose_most_common(exact_counts), accentless=choose_most_common(accentless_counts))
 
@@ -266,27 +540,46 @@ def load_frequency_map(path: Path) -> Dict[str, int]:
 
 
 def canonical_pos(value: str) -> str:
-    normalized = value.strip().lower()
-    if normalized in POS_ALIASES:
-        return POS_ALIASES[normalized]
-    return value.strip()
+    resolved = POS_RESOLUTION.get(value)
+    if resolved is None:
+        stripped = value.strip()
+        resolved = POS_ALIASES.get(stripped.lower(), stripped)
+        POS_RESOLUTION[value] = resolved
+    return resolved
+
 
+def canonical_pos_code(value: str) -> int:
+    code = POS_CODE_RESOLUTION.get(value)
+    if code is None:
+        code = POS_CODES.encode(canonical_pos(value))
+        POS_CODE_RESOLUTION[value] = code
+    return code
 
-def lookup_pos_from_source(word: str, lookup: Optional[PosLookup]) -> str:
+
+def lookup_pos_from_source(word: str, lookup: Optional[PosLookup]) -> int:
+    return lookup_pos_by_key(normalize_word(word), lookup)
+
+
+def lookup_pos_by_key(key: str, lookup: Optional[PosLookup]) -> int:
     if not lookup:
-        return ""
-    key = normalize_word(word)
-    if key in lookup.exact:
-        return lookup.exact[key]
-    accentless = strip_accents(key)
-    if accentless in lookup.accentless:
-        return lookup.accentless[accentless]
-    return ""
+        return 0
+    return lookup.exact.get(key) or lookup.accentless.get(strip_accents(key))
 
 
-def heuristic_pos(word: str, english: str) -> str:
+def heuristic_pos(word: str, english: str, suffix_model: Optional[LazySuffixModel] = None) -> str:
+    """Guess a POS for a word no source knows: English "to ..." glosses, then word endings.
+
+    A trained suffix model answers first when its longest-suffix prediction
+    reaches MIN_SUFFIX_CONFIDENCE; otherwise (or without a model) the fixed
+    ending rules below decide.
+    """
     if english.lower().startswith("to "):
         return "verb"
+    model = suffix_model.get() if suffix_model is not None else None
+    if model is not None:
+        prediction = model.predict(word)
+        if prediction is not None and prediction[1] >= MIN_SUFFIX_CONFIDENCE:
+            return prediction[0]
     if word.endswith("mente"):
         return "adv"
     if word.endswith(("ción", "sión", "dad", "tad", "aje", "umbre", "ez")):
@@ -296,37 +589,35 @@ def heuristic_pos(word: str, english: str) -> str:
     return ""
 
 
-def resolve_pos(word: str, english: str, source_pos: str, lookup: Optional[PosLookup]) -> str:
-    pos = lookup_pos_from_source(word, lookup)
-    if pos:
-        return pos
-    canonical_source = canonical_pos(source_pos) if source_pos else ""
-    if canonical_source:
-        return canonical_source
-    return heuristic_pos(word, english)
+def resolve_pos(
+    word: str,
+    english: str,
+    source_pos: str,
+    lookup_pos: int,
+    suffix_model: Optional[LazySuffixModel] = None,
+) -> int:
+    """Pick the POS code for a word given its already-computed Kaikki lookup result."""
+    if lookup_pos:
+        return lookup_pos
+    if source_pos:
+        canonical_source = canonical_pos_code(source_pos)
+        if canonical_source:
+            return canonical_source
+    return POS_CODES.encode(heuristic_pos(word, english, suffix_model))
+
+
+def cefr_band(rank: int) -> str:
+    return CEFR_BAND_LABELS[bisect.bisect_left(CEFR_BAND_LIMITS, rank)]
 
 
 def infer_cefr(word: str, freq_map: Dict[str, int]) -> str:
-    if not freq_map:
-        return "X"
-    rank = freq_map.get(normalize_word(word))
+    return cefr_for_rank(freq_map.get(normalize_word(word)))
+
+
+def cefr_for_rank(rank: Optional[int]) -> str:
     if rank is None:
-        return "X"
-    if rank <= 500:
-        return "A1.1"
-    if rank <= 1500:
-        return "A1.2"
-    if rank <= 3000:
-        return "A2.1"
-    if rank <= 6000:
-        return "A2.2"
-    if rank <= 10000:
-        return "B1.1"
-    if rank <= 15000:
-        return "B1.2"
-    if rank <= 22000:
-        return "B2.1"
-    return "B2.2"
+        return CEFR_UNKNOWN
+    return cefr_band(rank)
 
 
 def determine_tags(word: str, english: str, pos: str) -> str:
@@ -335,14 +626,69 @@ def determine_tags(word: str, english: str, pos: str) -> str:
     return ""
 
 
-def suggest_pos_from_lookup(word: str, lookup: Optional[PosLookup]) -> str:
-    if not lookup:
-        return ""
-    return lookup_pos_from_source(word, lookup)
+@dataclass(slots=True)
+class RowResolution:
+    """Raw lookups and final decisions for one input row, computed once."""
+
+    lookup_pos: int  # Kaikki POS code (0 when missing); doubles as pos_suggested
+    inferred_cefr: str  # frequency-band CEFR; doubles as cefr_suggested
+    pos: int
+    cefr: str
+    tags: str
+
+
+def resolve_row(
+    word: str,
+    english: str,
+    source_pos: str,
+    reference: Dict[str, ReferenceEntry],
+    freq_map: Dict[str, int],
+    pos_lookup: Optional[PosLookup],
+) -> RowResolution:
+    key = normalize_word(word)
+    lookup_pos = lookup_pos_by_key(key, pos_lookup)
+    suffix_model = pos_lookup.suffix_model if pos_lookup is not None else None
+    inferred_cefr = cefr_for_rank(freq_map.get(key))
+    entry = reference.get(key)
+    if entry:
+        pos = entry.pos or resolve_pos(word, english, source_pos, lookup_pos, suffix_model)
+        cefr = CEFR_CODES.decode(entry.cefr) or inferred_cefr
+        tags = entry.tags or determine_tags(word, english, POS_CODES.decode(pos))
+    else:
+        pos = resolve_pos(word, english, source_pos, lookup_pos, suffix_model)
+        cefr = inferred_cefr
+        tags = determine_tags(word, english, POS_CODES.decode(pos))
+    return RowResolution(lookup_pos=lookup_pos, inferred_cefr=inferred_cefr, pos=pos, cefr=cefr, tags=tags)
 
 
-def suggest_cefr_from_frequency(word: str, freq_map: Dict[str, int]) -> str:
-    return infer_cefr(word, freq_map)
+def load_resources_from_db(
+    path: Path, words: Iterable[str]
+) -> Tuple[Dict[str, ReferenceEntry], Dict[str, int], PosLookup]:
+    """Join the input words against the database tables and return the matching subsets."""
+    import vocab_db
+
+    keys = {normalize_word(word) for word in words}
+    accentless_keys = {strip_accents(key) for key in keys}
+    conn = vocab_db.connect(path)
+    try:
+        reference = {
+            key: ReferenceEntry(
+                spanish=spanish,
+                pos=POS_CODES.encode(pos),
+                cefr=CEFR_CODES.encode(cefr),
+                tags=tags,
+            )
+            for key, (spanish, pos, cefr, tags) in vocab_db.fetch_reference(conn, keys).items()
+        }
+        freq_map = vocab_db.fetch_frequency(conn, keys)
+        exact, accentless = vocab_db.fetch_pos_lookup(conn, keys, accentless_keys)
+    finally:
+        conn.close()
+    lookup = PosLookup(
+        exact=CodeMap({key: POS_CODES.encode(pos) for key, pos in exact.items()}),
+        accentless=CodeMap({key: POS_CODES.encode(pos) for key, pos in accentless.items()}),
+    )
+    return reference, freq_map, lookup
 
 
 def derive_output_path(input_path: Path, explicit: Optional[Path]) -> Path:
@@ -356,10 +702,9 @@ def derive_output_path(input_path: Path, explicit: Optional[Path]) -> Path:
 
 
 def read_missing_rows(path: Path) -> Tuple[List[str], List[List[str]]]:
-    with path.open("r", encoding="utf-8") as handle:
-        reader = csv.reader(handle, delimiter="\t")
-        header = next(reader)
-        rows = [row for row in reader if row]
+    reader = map_tsv_rows(path)
+    header = next(reader)
+    rows = [row for row in reader if row]
     return header, rows
 
 
@@ -373,51 +718,175 @@ def header_index(header: Sequence[str], *targets: str) -> Optional[int]:
     return None
 
 
-def enrich_rows(
-    rows: List[List[str]],
+def iter_enriched_rows(
+    rows: Iterable[List[str]],
     header: Sequence[str],
     reference: Dict[str, ReferenceEntry],
     freq_map: Dict[str, int],
     pos_lookup: Optional[PosLookup],
     include_suggestions: bool,
-) -> List[List[str]]:
+) -> Iterator[List[str]]:
     word_idx = header_index(header, "word", "spanish")
     def_idx = header_index(header, "definition", "english")
     pos_idx = header_index(header, "pos")
     if word_idx is None:
         raise ValueError("Input TSV must include a 'word' column.")
-    enriched: List[List[str]] = []
+    pos_values = POS_CODES.values
     for row in rows:
         word = row[word_idx].strip()
         english = row[def_idx].strip() if def_idx is not None and len(row) > def_idx else ""
         source_pos = row[pos_idx].strip() if pos_idx is not None and len(row) > pos_idx else ""
-        key = normalize_word(word)
-        entry = reference.get(key)
-        if entry:
-            pos = canonical_pos(entry.pos) or resolve_pos(word, english, source_pos, pos_lookup)
-            cefr = entry.cefr or infer_cefr(word, freq_map)
-            tags = entry.tags or determine_tags(word, english, pos)
-        else:
-            pos = resolve_pos(word, english, source_pos, pos_lookup)
-            cefr = infer_cefr(word, freq_map)
-            tags = determine_tags(word, english, pos)
-        row_out = [word, english, pos, cefr, tags]
+        resolution = resolve_row(word, english, source_pos, reference, freq_map, pos_lookup)
+        pos = pos_values[resolution.pos]
         if include_suggestions:
-            suggested_pos = suggest_pos_from_lookup(word, pos_lookup)
-            suggested_cefr = suggest_cefr_from_frequency(word, freq_map)
-            row_out.extend([suggested_pos, suggested_cefr])
-        enriched.append(row_out)
-    return enriched
+            yield [
+                word,
+                english,
+                pos,
+                resolution.cefr,
+                resolution.tags,
+                pos_values[resolution.lookup_pos],
+                resolution.inferred_cefr,
+            ]
+        else:
+            yield [word, english, pos, resolution.cefr, resolution.tags]
 
 
-def write_output(rows: List[List[str]], path: Path, include_suggestions: bool) -> None:
-    with path.open("w", encoding="utf-8", newline="") as handle:
+def enrich_rows(
+    rows: List[List[str]],
+    header: Sequence[str],
+    reference: Dict[str, ReferenceEntry],
+    freq_map: Dict[str, int],
+    pos_lookup: Optional[PosLookup],
+    include_suggestions: bool,
+) -> List[List[str]]:
+    return list(iter_enriched_rows(rows, header, reference, freq_map, pos_lookup, include_suggestions))
+
+
+@dataclass
+class Checkpoint:
+    rows: int
+    bytes: int
+
+
+def checkpoint_paths(output: Path) -> Tuple[Path, Path]:
+    """Return ``(<output>.partial, <output>.checkpoint.json)``."""
+    return output.with_name(output.name + ".partial"), output.with_name(output.name + ".checkpoint.json")
+
+
+def resource_signature(path: Path) -> Optional[List[List[object]]]:
+    """JSON-ready ``[name, size, mtime_ns]`` of each file behind ``path``, or None if it is missing."""
+    signature = source_signature(path)
+    return None if signature is None else [list(entry) for entry in signature]
+
+
+def run_fingerprint(args: argparse.Namespace) -> Dict[str, object]:
+    """Identify the input, options, and resources a checkpoint belongs to.
+
+    Files are identified by path, size, and modification time (no hashing of
+    large inputs), so resuming after swapping a reference file, frequency
+    list, POS source, POS model, or database is refused.
+    """
+    stat = args.input.stat()
+    fingerprint: Dict[str, object] = {
+        "input": str(args.input.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "include_suggestions": args.include_suggestions,
+        "pos_model": resource_signature(args.pos_model),
+    }
+    if args.db:
+        fingerprint["db"] = resource_signature(args.db)
+    else:
+        fingerprint["reference"] = [
+            [str(path), resource_signature(path)] for path in reference_paths(args)
+        ]
+        fingerprint["merge_strategy"] = args.merge_strategy
+        fingerprint["frequency"] = resource_signature(args.frequency)
+        fingerprint["pos_source"] = resource_signature(args.pos_source)
+    return fingerprint
+
+
+def load_checkpoint(output: Path, fingerprint: Dict[str, object]) -> Optional[Checkpoint]:
+    partial_path, checkpoint_path = checkpoint_paths(output)
+    if not checkpoint_path.is_file() or not partial_path.is_file():
+        return None
+    with checkpoint_path.open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if data.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"unsupported checkpoint version in {checkpoint_path}")
+    if data.get("fingerprint") != fingerprint:
+        raise ValueError(f"{checkpoint_path} was written for a different input file, options, or resources")
+    if partial_path.stat().st_size < data["bytes"]:
+        raise ValueError(f"{partial_path} is shorter than its checkpoint")
+    return Checkpoint(rows=data["rows"], bytes=data["bytes"])
+
+
+def save_checkpoint(path: Path, fingerprint: Dict[str, object], checkpoint: Checkpoint) -> None:
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "fingerprint": fingerprint,
+        "rows": checkpoint.rows,
+        "bytes": checkpoint.bytes,
+    }
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def sync_handle(handle) -> int:
+    """Flush ``handle`` to disk and return the file size."""
+    handle.flush()
+    os.fsync(handle.fileno())
+    return os.fstat(handle.fileno()).st_size
+
+
+def output_header(include_suggestions: bool) -> List[str]:
+    header = ["word", "definition", "pos", "cefr", "tags"]
+    if include_suggestions:
+        header += ["pos_suggested", "cefr_suggested"]
+    return header
+
+
+def write_output(
+    rows: Iterable[List[str]],
+    path: Path,
+    include_suggestions: bool,
+    *,
+    fingerprint: Dict[str, object],
+    resume_from: Optional[Checkpoint] = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_ROWS,
+) -> int:
+    """Stream ``rows`` into ``<path>.partial`` with periodic checkpoints, then rename it to ``path``.
+
+    Every ``checkpoint_every`` rows the partial file is fsynced and its size
+    and the number of rows written are recorded (atomically, via rename) in
+    ``<path>.checkpoint.json``. When resuming, the partial file is cut back
+    to the checkpointed size, dropping any rows written after it, and new
+    rows are appended. ``path`` itself only appears once every row is done.
+    Returns the total number of rows in the output.
+    """
+    partial_path, checkpoint_path = checkpoint_paths(path)
+    if resume_from is not None:
+        with partial_path.open("r+b") as raw:
+            raw.truncate(resume_from.bytes)
+        written = resume_from.rows
+    else:
+        written = 0
+    with partial_path.open("a" if resume_from is not None else "w", encoding="utf-8", newline="") as handle:
         writer = csv.writer(handle, delimiter="\t")
-        header = ["word", "definition", "pos", "cefr", "tags"]
-        if include_suggestions:
-            header += ["pos_suggested", "cefr_suggested"]
-        writer.writerow(header)
-        writer.writerows(rows)
+        if resume_from is None:
+            writer.writerow(output_header(include_suggestions))
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+            if checkpoint_every > 0 and written % checkpoint_every == 0:
+                size = sync_handle(handle)
+                save_checkpoint(checkpoint_path, fingerprint, Checkpoint(rows=written, bytes=size))
+        sync_handle(handle)
+    os.replace(partial_path, path)
+    checkpoint_path.unlink(missing_ok=True)
+    return written
 
 
 def ensure_frequency_resource(path: Path) -> None:
@@ -446,30 +915,67 @@ def ensure_pos_resource(path: Path) -> None:
 
 def main() -> None:
     args = parse_args()
-    try:
-        ensure_frequency_resource(args.frequency)
-    except RuntimeError as exc:
-        sys.exit(str(exc))
-    try:
-        ensure_pos_resource(args.pos_source)
-    except RuntimeError as exc:
-        sys.exit(str(exc))
-
-    reference = build_reference_list(args)
-    freq_map = load_frequency_map(args.frequency)
-    pos_lookup = load_pos_lookup(args.pos_source)
     header, rows = read_missing_rows(args.input)
-    enriched = enrich_rows(
-        rows,
+    if args.db and args.conflict_report:
+        sys.exit("--conflict-report needs the reference files and cannot be combined with --db.")
+    word_idx = header_index(header, "word", "spanish")
+    if word_idx is None:
+        sys.exit("Input TSV must include a 'word' column.")
+
+    if not args.db:
+        try:
+            ensure_frequency_resource(args.frequency)
+        except RuntimeError as exc:
+            sys.exit(str(exc))
+        try:
+            ensure_pos_resource(args.pos_source)
+        except RuntimeError as exc:
+            sys.exit(str(exc))
+
+    output_path = derive_output_path(args.input, args.output)
+    fingerprint = run_fingerprint(args)
+    resume_from: Optional[Checkpoint] = None
+    if args.resume:
+        try:
+            resume_from = load_checkpoint(output_path, fingerprint)
+        except ValueError as exc:
+            sys.exit(f"Cannot resume: {exc}")
+        if resume_from is None:
+            print(f"No checkpoint for {output_path}; starting from the first row.")
+        else:
+            print(f"Resuming after {resume_from.rows} of {len(rows)} rows.")
+    remaining = rows[resume_from.rows :] if resume_from is not None else rows
+
+    if args.db:
+        words = (row[word_idx] for row in remaining if len(row) > word_idx)
+        reference, freq_map, pos_lookup = load_resources_from_db(args.db, words)
+    else:
+        merge = build_reference_list(args)
+        reference = merge.entries
+        if args.conflict_report:
+            write_conflict_report(merge, args.conflict_report)
+            print(f"Wrote {len(merge.conflicts)} reference conflicts to {args.conflict_report}")
+        freq_map = load_frequency_map(args.frequency)
+        pos_lookup = load_pos_lookup(args.pos_source)
+    if pos_lookup is not None:
+        pos_lookup.suffix_model = LazySuffixModel(args.pos_model)
+    enriched = iter_enriched_rows(
+        remaining,
         header,
         reference,
         freq_map,
         pos_lookup,
         args.include_suggestions,
     )
-    output_path = derive_output_path(args.input, args.output)
-    write_output(enriched, output_path, args.include_suggestions)
-    print(f"Wrote {len(enriched)} rows to {output_path}")
+    written = write_output(
+        enriched,
+        output_path,
+        args.include_suggestions,
+        fingerprint=fingerprint,
+        resume_from=resume_from,
+        checkpoint_every=args.checkpoint_every,
+    )
+    print(f"Wrote {written} rows to {output_path}")
 
 
 if __name__ == "__main__":
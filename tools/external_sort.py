@@ -0,0 +1,122 @@
+"""Disk-backed sorting for inputs that do not fit in memory."""
+from __future__ import annotations
+
+import heapq
+import pickle
+import re
+import tempfile
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional
+
+
+SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*$", re.IGNORECASE)
+SIZE_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+MIN_BUDGET = 1 << 20
+# Runs merged at once; more runs than this are merged in several passes.
+MERGE_FAN_IN = 64
+# Rough per-object overheads (CPython, 64-bit) used to estimate buffer size.
+STR_OVERHEAD = 49
+CONTAINER_OVERHEAD = 56
+SLOT_SIZE = 8
+
+
+def parse_size(value: str) -> int:
+    """Parse ``512M``/``2G``/``65536`` style sizes into bytes."""
+    match = SIZE_RE.match(value)
+    if not match:
+        raise ValueError(f"invalid size: {value!r} (use e.g. 256M or 2G)")
+    size = int(float(match.group(1)) * SIZE_UNITS[match.group(2).lower()])
+    if size < MIN_BUDGET:
+        raise ValueError(f"memory budget must be at least {MIN_BUDGET >> 20}M")
+    return size
+
+
+def approx_size(item: Any) -> int:
+    """Approximate in-memory footprint of a buffered record (strings, ints, tuples/lists of them)."""
+    if isinstance(item, str):
+        return STR_OVERHEAD + len(item)
+    if isinstance(item, (tuple, list)):
+        return CONTAINER_OVERHEAD + sum(SLOT_SIZE + approx_size(part) for part in item)
+    return 32
+
+
+class ExternalSorter:
+    """Collect items, spilling sorted runs to temp files once the buffer passes ``memory_budget``.
+
+    ``sorted()`` yields every added item in order: straight from memory when
+    nothing was spilled, otherwise through a k-way ``heapq.merge`` of the runs.
+    Items must be picklable and mutually comparable (or ordered by ``key``).
+    """
+
+    def __init__(
+        self,
+        memory_budget: int,
+        *,
+        key: Optional[Callable[[Any], Any]] = None,
+        tmp_dir: Optional[str] = None,
+    ) -> None:
+        self.memory_budget = memory_budget
+        self.key = key
+        self.tmp_dir = tmp_dir
+        self.buffer: List[Any] = []
+        self.buffered_bytes = 0
+        self.runs: List[IO[bytes]] = []
+
+    def add(self, item: Any) -> None:
+        self.buffer.append(item)
+        self.buffered_bytes += approx_size(item) + SLOT_SIZE
+        if self.buffered_bytes >= self.memory_budget:
+            self.spill()
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.add(item)
+
+    def spill(self) -> None:
+        if not self.buffer:
+            return
+        self.buffer.sort(key=self.key)
+        self.runs.append(self.write_run(self.buffer))
+        self.buffer = []
+        self.buffered_bytes = 0
+
+    def write_run(self, items: Iterable[Any]) -> IO[bytes]:
+        handle = tempfile.TemporaryFile(dir=self.tmp_dir)
+        # One pickle per item: a shared Pickler/Unpickler memo would keep every item alive.
+        for item in items:
+            pickle.dump(item, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        handle.seek(0)
+        return handle
+
+    @staticmethod
+    def read_run(handle: IO[bytes]) -> Iterator[Any]:
+        try:
+            while True:
+                yield pickle.load(handle)
+        except EOFError:
+            handle.close()
+
+    def sorted(self) -> Iterator[Any]:
+        if not self.runs:
+            self.buffer.sort(key=self.key)
+            items, self.buffer, self.buffered_bytes = self.buffer, [], 0
+            yield from items
+            return
+        self.spill()
+        while len(self.runs) > MERGE_FAN_IN:
+            group, self.runs = self.runs[:MERGE_FAN_IN], self.runs[MERGE_FAN_IN:]
+            merged = heapq.merge(*(self.read_run(run) for run in group), key=self.key)
+            self.runs.append(self.write_run(merged))
+        runs, self.runs = self.runs, []
+        yield from heapq.merge(*(self.read_run(run) for run in runs), key=self.key)
+
+    def close(self) -> None:
+        for run in self.runs:
+            run.close()
+        self.runs = []
+        self.buffer = []
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,169 @@
+"""Longest-suffix POS classifier used when a word is missing from every POS source."""
+from __future__ import annotations
+
+import string
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+
+MODEL_MAGIC = "# pos-suffix-model v1"
+DEFAULT_MAX_SUFFIX = 6
+DEFAULT_MIN_SUPPORT = 3
+# A longer suffix is only stored when it changes the prediction or moves the
+# confidence by at least this much; otherwise its parent already answers.
+PRUNE_DELTA = 0.02
+# Pseudo-counts borrowed from the parent suffix's distribution when training.
+SMOOTHING = 3.0
+
+EDGE_PUNCTUATION = string.punctuation + "¡¿"
+
+Prediction = Tuple[str, float]
+
+
+def model_key(word: str) -> str:
+    """Lowercased NFC form of a single word without edge punctuation, or "" for blanks and multi-word entries."""
+    key = unicodedata.normalize("NFC", word.strip().lower()).strip(EDGE_PUNCTUATION)
+    return "" if not key or " " in key else key
+
+
+class SuffixModel:
+    """Flattened suffix trie: each kept suffix maps to ``(pos, confidence)``.
+
+    predict() probes the word's suffixes from longest to shortest, so a lookup
+    costs at most ``max_suffix`` dict probes (O(word length)).
+    """
+
+    __slots__ = ("entries", "max_suffix")
+
+    def __init__(self, entries: Dict[str, Prediction], max_suffix: int) -> None:
+        self.entries = entries
+        self.max_suffix = max_suffix
+
+    def predict(self, word: str) -> Optional[Prediction]:
+        key = model_key(word)
+        for length in range(min(len(key), self.max_suffix), 0, -1):
+            hit = self.entries.get(key[-length:])
+            if hit is not None:
+                return hit
+        return None
+
+    def save(self, path: Path, *, words: int, min_support: int) -> None:
+        """Write ``suffix<TAB>pos<TAB>confidence`` lines (shortest suffixes first) atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8", newline="\n") as handle:
+            handle.write(
+                f"{MODEL_MAGIC} max_suffix={self.max_suffix} min_support={min_support} words={words}\n"
+            )
+            for suffix in sorted(self.entries, key=lambda value: (len(value), value)):
+                pos, confidence = self.entries[suffix]
+                handle.write(f"{suffix}\t{pos}\t{confidence:.3f}\n")
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SuffixModel":
+        entries: Dict[str, Prediction] = {}
+        with path.open("r", encoding="utf-8") as handle:
+            header = handle.readline()
+            if not header.startswith(MODEL_MAGIC):
+                raise ValueError(f"{path} is not a POS suffix model")
+            settings = dict(part.split("=", 1) for part in header[len(MODEL_MAGIC) :].split() if "=" in part)
+            for line in handle:
+                suffix, pos, confidence = line.rstrip("\n").split("\t")
+                entries[suffix] = (pos, float(confidence))
+        return cls(entries, int(settings.get("max_suffix", DEFAULT_MAX_SUFFIX)))
+
+
+class LazySuffixModel:
+    """Defers reading the model file until a word actually needs it."""
+
+    __slots__ = ("path", "model", "loaded")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.model: Optional[SuffixModel] = None
+        self.loaded = False
+
+    @classmethod
+    def preloaded(cls, model: SuffixModel) -> "LazySuffixModel":
+        lazy = cls(Path())
+        lazy.model, lazy.loaded = model, True
+        return lazy
+
+    def get(self) -> Optional[SuffixModel]:
+        """The loaded model, or None when the file is missing or unreadable."""
+        if not self.loaded:
+            self.loaded = True
+            try:
+                self.model = SuffixModel.load(self.path)
+            except (OSError, ValueError):
+                self.model = None
+        return self.model
+
+
+def train(
+    labelled: Dict[str, str],
+    *,
+    max_suffix: int = DEFAULT_MAX_SUFFIX,
+    min_support: int = DEFAULT_MIN_SUPPORT,
+) -> SuffixModel:
+    """Build a model from ``{word: pos}``; every word counts once towards each of its suffixes.
+
+    Each suffix's POS distribution is smoothed towards that of the nearest
+    shorter suffix that passed ``min_support`` (the overall POS mix for
+    single letters) with SMOOTHING pseudo-counts, so a handful of odd words
+    cannot override a well-attested shorter suffix. Suffixes seen fewer than ``min_support`` times are
+    dropped, as are suffixes whose prediction and confidence match their
+    nearest kept shorter suffix (longest-match lookup falls back to it anyway).
+    """
+    counts: Dict[str, Counter] = {}
+    prior: Counter = Counter()
+    for word, pos in labelled.items():
+        key = model_key(word)
+        if not key or not pos:
+            continue
+        prior[pos] += 1
+        for length in range(1, min(len(key), max_suffix) + 1):
+            counts.setdefault(key[-length:], Counter())[pos] += 1
+
+    total = sum(prior.values())
+    smoothed: Dict[str, Dict[str, float]] = {"": {pos: count / total for pos, count in prior.items()}}
+    entries: Dict[str, Prediction] = {}
+    for suffix in sorted(counts, key=len):
+        tally = counts[suffix]
+        support = sum(tally.values())
+        if support < min_support:
+            continue
+        parent = next(smoothed[suffix[start:]] for start in range(1, len(suffix) + 1) if suffix[start:] in smoothed)
+        dist = {
+            pos: (tally.get(pos, 0) + SMOOTHING * share) / (support + SMOOTHING)
+            for pos, share in parent.items()
+        }
+        smoothed[suffix] = dist
+        pos, share = min(dist.items(), key=lambda item: (-item[1], item[0]))
+        confidence = round(share, 3)
+        kept = nearest_entry(entries, suffix)
+        if kept is not None and kept[0] == pos and abs(kept[1] - confidence) < PRUNE_DELTA:
+            continue
+        entries[suffix] = (pos, confidence)
+    return SuffixModel(entries, max_suffix)
+
+
+def nearest_entry(entries: Dict[str, Prediction], suffix: str) -> Optional[Prediction]:
+    for start in range(1, len(suffix)):
+        hit = entries.get(suffix[start:])
+        if hit is not None:
+            return hit
+    return None
+
+
+def label_pairs(pairs: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """Collapse ``(word, pos)`` pairs to one label per word, first occurrence winning."""
+    labelled: Dict[str, str] = {}
+    for word, pos in pairs:
+        key = model_key(word)
+        if key and pos and key not in labelled:
+            labelled[key] = pos
+    return labelled
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""Accent-folded prefix/substring search index over the word and definition columns."""
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import json
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from compare_vocab import sanitize_word
+
+
+SEARCH_VERSION = 2
+MODES = ("words", "substring")
+COLUMNS = ("word", "definition")
+# Characters compared per sorting pass; only ties on a whole chunk look further.
+SORT_CHUNK = 16
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents exactly like ``compare_vocab.py --ignore-accents``."""
+    return sanitize_word(text, ignore_accents=True, strip_punct=False)
+
+
+def folded_texts(words: Sequence[str], definitions: Sequence[str]) -> List[str]:
+    """Folded cells in index order: text ``row * 2 + column`` (0 = word, 1 = definition)."""
+    return [fold(value) for pair in zip(words, definitions) for value in pair]
+
+
+def word_starts(text: str) -> Iterable[int]:
+    """Offset 0 plus every alphanumeric character that follows a non-alphanumeric one."""
+    if text:
+        yield 0
+    for offset in range(1, len(text)):
+        if text[offset].isalnum() and not text[offset - 1].isalnum():
+            yield offset
+
+
+def sort_suffixes(entries: List[int], text_of: Callable[[int], str], offset_of: Callable[[int], int]) -> None:
+    """Sort packed entries in place by the suffix each one stands for.
+
+    Entries are keyed by SORT_CHUNK characters at a time and only runs that
+    tie on a full chunk are re-sorted on the next chunk, so no suffix is ever
+    copied whole and memory stays linear in the number of entries.
+    """
+    pending = [(0, len(entries), 0)]
+    while pending:
+        lo, hi, depth = pending.pop()
+        start = depth * SORT_CHUNK
+
+        def chunk(packed: int) -> str:
+            begin = offset_of(packed) + start
+            return text_of(packed)[begin : begin + SORT_CHUNK]
+
+        entries[lo:hi] = sorted(entries[lo:hi], key=chunk)
+        pos = lo
+        for key, group in itertools.groupby(entries[lo:hi], key=chunk):
+            size = sum(1 for _ in group)
+            if size > 1 and len(key) == SORT_CHUNK:
+                pending.append((pos, pos + size, depth + 1))
+            pos += size
+
+
+def build_search_index(
+    words: Sequence[str], definitions: Sequence[str], *, substring: bool = False
+) -> Dict[str, object]:
+    """Suffix array over the folded word/definition cells of rows ``0..len(words)-1``.
+
+    The cells themselves are not stored: the index ships next to the bundle
+    and each ``suffixes`` entry packs ``(row * 2 + column) * stride + offset``,
+    standing for ``fold(cell)[offset:]``. Entries are sorted by that text.
+    By default only word starts are indexed (``mode: "words"``); with
+    ``substring=True`` every character offset is (``mode: "substring"``), which
+    makes the index several times larger.
+    """
+    texts = folded_texts(words, definitions)
+    stride = max((len(text) for text in texts), default=0) + 1
+    starts = (lambda text: range(len(text))) if substring else word_starts
+    suffixes = [idx * stride + offset for idx, text in enumerate(texts) for offset in starts(text)]
+    sort_suffixes(suffixes, lambda packed: texts[packed // stride], lambda packed: packed % stride)
+    return {
+        "version": SEARCH_VERSION,
+        "mode": MODES[substring],
+        "rows": len(words),
+        "stride": stride,
+        "suffixes": suffixes,
+    }
+
+
+class SearchIndex:
+    """Query side of build_search_index(); lookups are O(log n) plus the size of the answer."""
+
+    __slots__ = ("mode", "stride", "suffixes", "texts")
+
+    def __init__(self, payload: Dict[str, object], words: Sequence[str], definitions: Sequence[str]) -> None:
+        if payload.get("version") != SEARCH_VERSION:
+            raise ValueError(f"Unsupported search index version: {payload.get('version')}")
+        if payload.get("rows") != len(words):
+            raise ValueError("Search index does not match the bundle (row counts differ).")
+        self.mode: str = payload["mode"]  # type: ignore[assignment]
+        self.stride: int = payload["stride"]  # type: ignore[assignment]
+        self.suffixes: List[int] = payload["suffixes"]  # type: ignore[assignment]
+        self.texts = folded_texts(words, definitions)
+
+    def matches(self, query: str) -> range:
+        """Positions in ``suffixes`` whose text starts with ``query`` (already folded)."""
+        width = len(query)
+
+        def head(packed: int) -> str:
+            offset = packed % self.stride
+            return self.texts[packed // self.stride][offset : offset + width]
+
+        lo = bisect.bisect_left(self.suffixes, query, key=head)
+        hi = bisect.bisect_right(self.suffixes, query, lo, key=head)
+        return range(lo, hi)
+
+    def rows(self, positions: Iterable[int], *, word_start: bool = False, whole: bool = False) -> List[int]:
+        found: set[int] = set()
+        for pos in positions:
+            packed = self.suffixes[pos]
+            idx, offset = divmod(packed, self.stride)
+            if whole and offset:
+                continue
+            if word_start and offset and (self.texts[idx][offset - 1].isalnum() or not self.texts[idx][offset].isalnum()):
+                continue
+            found.add(idx // len(COLUMNS))
+        return sorted(found)
+
+    def prefix(self, query: str) -> List[int]:
+        """Rows whose folded word or definition starts with ``query``."""
+        folded = fold(query)
+        return self.rows(self.matches(folded), whole=True) if folded else []
+
+    def word_prefix(self, query: str) -> List[int]:
+        """Rows where ``query`` starts at a word boundary (e.g. ``conv`` finds "to converse")."""
+        folded = fold(query)
+        if not folded:
+            return []
+        return self.rows(self.matches(folded), word_start=self.mode == "substring")
+
+    def contains(self, query: str) -> List[int]:
+        """Rows whose folded word or definition contains ``query`` anywhere (substring indexes only)."""
+        if self.mode != "substring":
+            raise ValueError("This index only covers word starts; rebuild it with build_bundle.py --substring-index.")
+        folded = fold(query)
+        return self.rows(self.matches(folded)) if folded else []
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Query the search index that build_bundle.py emits next to the vocabulary bundle."
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=Path("public") / "data" / "words.manifest.json",
+        help="Bundle manifest written by build_bundle.py (default: public/data/words.manifest.json).",
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--prefix", help="Match words/definitions starting with this text.")
+    mode.add_argument("--word", help="Match words/definitions with a word starting with this text.")
+    mode.add_argument(
+        "--contains", help="Match words/definitions containing this text (needs --substring-index)."
+    )
+    parser.add_argument("--limit", type=int, default=20, help="Rows to print (default: 20).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.manifest.is_file():
+        sys.exit(f"Manifest not found: {args.manifest} (run build_bundle.py first)")
+    with args.manifest.open("r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    if "search" not in manifest:
+        sys.exit(f"{args.manifest} has no search index; rebuild it with build_bundle.py.")
+    with (args.manifest.parent / manifest["bundle"]).open("r", encoding="utf-8") as handle:
+        columns = json.load(handle)["columns"]
+    with (args.manifest.parent / manifest["search"]).open("r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    try:
+        index = SearchIndex(payload, columns["word"], columns["definition"])
+        if args.prefix is not None:
+            rows = index.prefix(args.prefix)
+        elif args.word is not None:
+            rows = index.word_prefix(args.word)
+        else:
+            rows = index.contains(args.contains)
+    except ValueError as exc:
+        sys.exit(str(exc))
+    for row in rows[: args.limit]:
+        print(f"{row:>6}  {columns['word'][row]}\t{columns['definition'][row]}")
+    more = f" (showing {args.limit})" if len(rows) > args.limit else ""
+    print(f"{len(rows)} matching rows{more}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Split a canonical vocab TSV into CEFR/POS shards with an index manifest."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+
+from enrich_missing_vocab import CEFR_BAND_LABELS, CEFR_UNKNOWN, canonical_pos, normalize_header
+from vocab_db import iter_raw_records
+from vocab_io import SHARD_MANIFEST_SUFFIX
+
+
+SHARD_FIELDS = ("cefr", "pos")
+NO_POS = "none"
+CEFR_SHARDS = set(CEFR_BAND_LABELS)
+
+
+@dataclass
+class Shard:
+    path: Path
+    handle: TextIO
+    digest: "hashlib._Hash"
+    values: Dict[str, str]
+    rows: int = 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Split words.tsv into separately loadable shards by CEFR band and/or POS."
+    )
+    parser.add_argument("--source", type=Path, required=True, help="Canonical TSV to split.")
+    parser.add_argument("--out-dir", type=Path, required=True, help="Directory for shards and manifest.")
+    parser.add_argument(
+        "--by",
+        default="cefr",
+        help="Comma-separated shard fields: cefr, pos, or cefr,pos (default: cefr).",
+    )
+    args = parser.parse_args()
+    fields = tuple(part.strip().lower() for part in args.by.split(",") if part.strip())
+    if not fields or any(field not in SHARD_FIELDS for field in fields) or len(set(fields)) != len(fields):
+        parser.error("--by must be 'cefr', 'pos', or 'cefr,pos'")
+    args.by = fields
+    return args
+
+
+def cefr_shard(value: str) -> str:
+    """Map a row's CEFR to one of the bands infer_cefr() produces (anything else -> X)."""
+    value = value.strip()
+    return value if value in CEFR_SHARDS else CEFR_UNKNOWN
+
+
+def pos_shard(value: str) -> str:
+    return canonical_pos(value) or NO_POS
+
+
+def safe_component(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", value).strip("-") or NO_POS
+
+
+def shard_file_name(stem: str, shard_key: Sequence[str], taken: set[str]) -> str:
+    """File name for ``shard_key`` that no earlier shard uses, even on a case-insensitive filesystem.
+
+    Distinct keys can sanitize to the same name (``n/a`` and ``n a``, or
+    ``Adj.`` and ``adj.`` on Windows); later ones get a short hash of the raw
+    values appended.
+    """
+    base = ".".join([stem] + [safe_component(value) for value in shard_key])
+    name = f"{base}.tsv"
+    if name.casefold() in taken:
+        digest = hashlib.sha256("\t".join(shard_key).encode("utf-8")).hexdigest()
+        length = 8
+        while name.casefold() in taken:
+            name = f"{base}-{digest[:length]}.tsv"
+            length += 1
+    taken.add(name.casefold())
+    return name
+
+
+def shard_dataset(source: Path, out_dir: Path, by: Sequence[str]) -> Path:
+    records = iter_raw_records(source)
+    first = next(records, None)
+    if first is None:
+        sys.exit(f"Empty TSV: {source}")
+    header_fields, header_raw = first
+    columns = [normalize_header(col) for col in header_fields]
+    indices: Dict[str, Optional[int]] = {
+        "cefr": columns.index("cefr") if "cefr" in columns else None,
+        "pos": columns.index("pos") if "pos" in columns else None,
+    }
+    for field in by:
+        if indices[field] is None:
+            sys.exit(f"{source} has no '{field}' column to shard by.")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    source_digest = hashlib.sha256(header_raw.encode("utf-8"))
+    shards: Dict[Tuple[str, ...], Shard] = {}
+    taken: set[str] = set()
+    try:
+        for fields, raw in records:
+            source_digest.update(raw.encode("utf-8"))
+            values: Dict[str, str] = {}
+            for field in by:
+                idx = indices[field]
+                cell = fields[idx] if idx is not None and idx < len(fields) else ""
+                values[field] = cefr_shard(cell) if field == "cefr" else pos_shard(cell)
+            shard_key = tuple(values[field] for field in by)
+            shard = shards.get(shard_key)
+            if shard is None:
+                path = out_dir / shard_file_name(source.stem, shard_key, taken)
+                handle = path.open("w", encoding="utf-8", newline="")
+                handle.write(header_raw)
+                digest = hashlib.sha256(header_raw.encode("utf-8"))
+                shard = shards[shard_key] = Shard(path=path, handle=handle, digest=digest, values=values)
+            if not raw.endswith(("\n", "\r")):
+                raw += "\n"
+            shard.handle.write(raw)
+            shard.digest.update(raw.encode("utf-8"))
+            shard.rows += 1
+    finally:
+        for shard in shards.values():
+            shard.handle.close()
+
+    ordered = sorted(shards.values(), key=lambda shard: shard_sort_key(shard, by))
+    manifest = {
+        "version": 1,
+        "source": source.name,
+        "source_sha256": source_digest.hexdigest(),
+        "by": list(by),
+        "header": list(header_fields),
+        "rows": sum(shard.rows for shard in ordered),
+        "shards": [
+            {
+                "file": shard.path.name,
+                **shard.values,
+                "rows": shard.rows,
+                "sha256": shard.digest.hexdigest(),
+            }
+            for shard in ordered
+        ],
+    }
+    manifest_path = out_dir / f"{source.stem}{SHARD_MANIFEST_SUFFIX}"
+    with manifest_path.open("w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, ensure_ascii=False, indent=2)
+        handle.write("\n")
+    return manifest_path
+
+
+def shard_sort_key(shard: Shard, by: Sequence[str]) -> List[Tuple[int, str]]:
+    order = CEFR_BAND_LABELS + [CEFR_UNKNOWN]
+    key: List[Tuple[int, str]] = []
+    for field in by:
+        value = shard.values[field]
+        if field == "cefr":
+            key.append((order.index(value), value))
+        else:
+            key.append((value == NO_POS, value))
+    return key
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.source.is_file():
+        sys.exit(f"File not found: {args.source}")
+    manifest_path = shard_dataset(args.source, args.out_dir, args.by)
+    with manifest_path.open("r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    for shard in manifest["shards"]:
+        print(f"  {shard['file']:<32} {shard['rows']:>7} rows")
+    print(f"Wrote {len(manifest['shards'])} shards ({manifest['rows']} rows); manifest: {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Train the suffix POS model and benchmark it against held-out words.tsv rows."""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+from enrich_missing_vocab import (
+    MIN_SUFFIX_CONFIDENCE,
+    POS_CODES,
+    POS_MODEL_FILE,
+    POS_SOURCE_FILE,
+    canonical_pos,
+    heuristic_pos,
+    load_pos_lookup,
+    merge_reference_files,
+    normalize_header,
+    reference_paths,
+)
+from pos_suffix_model import (
+    DEFAULT_MAX_SUFFIX,
+    DEFAULT_MIN_SUPPORT,
+    LazySuffixModel,
+    label_pairs,
+    model_key,
+    train,
+)
+from vocab_io import iter_table_rows
+
+
+DEFAULT_WORDS = Path("public") / "data" / "words.tsv"
+THRESHOLDS = (0.0, 0.5, 0.6, 0.7, 0.8, 0.9)
+MIN_BENCH_LOOKUPS = 200_000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Train the longest-suffix POS model used by enrich_missing_vocab.py, or benchmark it."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_training_flags(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument(
+            "--pos-source",
+            type=Path,
+            default=POS_SOURCE_FILE,
+            help="Kaikki/Wiktionary dump (es-extract.jsonl.gz) to learn from.",
+        )
+        sub.add_argument(
+            "--reference",
+            type=Path,
+            action="append",
+            help=(
+                "Reference TSV/XLSX files (or sharded datasets) to learn from; their POS wins over "
+                "Kaikki. Defaults to data/*.tsv and Vocab List Work Files/*.tsv."
+            ),
+        )
+        sub.add_argument(
+            "--max-suffix",
+            type=int,
+            default=DEFAULT_MAX_SUFFIX,
+            help=f"Longest suffix to learn (default: {DEFAULT_MAX_SUFFIX}).",
+        )
+        sub.add_argument(
+            "--min-support",
+            type=int,
+            default=DEFAULT_MIN_SUPPORT,
+            help=f"Drop suffixes seen on fewer words than this (default: {DEFAULT_MIN_SUPPORT}).",
+        )
+        sub.add_argument(
+            "--words",
+            type=Path,
+            default=DEFAULT_WORDS,
+            help=(
+                f"Canonical TSV whose labelled rows are also learned from (default: {DEFAULT_WORDS}); "
+                "bench holds some of them out."
+            ),
+        )
+
+    train_parser = subparsers.add_parser("train", help="Train and save the model.")
+    add_training_flags(train_parser)
+    train_parser.add_argument(
+        "--output",
+        type=Path,
+        default=POS_MODEL_FILE,
+        help=f"Model file to write (default: {POS_MODEL_FILE}).",
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Hold out words.tsv rows, train on the rest, and report accuracy and throughput."
+    )
+    add_training_flags(bench_parser)
+    bench_parser.add_argument(
+        "--holdout-every",
+        type=int,
+        default=10,
+        help="Hold out about 1 in N words, chosen by a stable hash of the word (default: 10).",
+    )
+    return parser.parse_args()
+
+
+def collect_labels(
+    pos_source: Path, references: Sequence[Path], exclude: Set[str] = frozenset()
+) -> Dict[str, str]:
+    """``{word: pos}`` from the reference files (first) and Kaikki, minus ``exclude``."""
+    merge = merge_reference_files(references)
+    reference_pairs = ((key, POS_CODES.decode(entry.pos)) for key, entry in merge.entries.items())
+    lookup = load_pos_lookup(pos_source)
+    kaikki_pairs = ((key, POS_CODES.decode(code)) for key, code in lookup.exact.items())
+    labelled = label_pairs(reference_pairs)
+    for key, pos in label_pairs(kaikki_pairs).items():
+        labelled.setdefault(key, pos)
+    for key in exclude:
+        labelled.pop(key, None)
+    return labelled
+
+
+def read_labelled_rows(path: Path) -> List[Tuple[str, str, str]]:
+    """``(word, english, pos)`` for single-word rows of ``path`` with a recognised POS."""
+    rows = iter_table_rows(path)
+    header = [normalize_header(col) for col in next(rows, [])]
+    try:
+        word_idx = header.index("word") if "word" in header else header.index("spanish")
+        pos_idx = header.index("pos")
+    except ValueError:
+        sys.exit(f"{path} needs word and pos columns.")
+    def_idx = header.index("definition") if "definition" in header else None
+    labelled: List[Tuple[str, str, str]] = []
+    for row in rows:
+        if len(row) <= max(word_idx, pos_idx):
+            continue
+        pos = canonical_pos(row[pos_idx])
+        word = row[word_idx].strip()
+        if not pos or not model_key(word):
+            continue
+        english = row[def_idx].strip() if def_idx is not None and len(row) > def_idx else ""
+        labelled.append((word, english, pos))
+    return labelled
+
+
+def training_labels(
+    args: argparse.Namespace, rows: Sequence[Tuple[str, str, str]], exclude: Set[str] = frozenset()
+) -> Dict[str, str]:
+    """The training set shared by ``train`` and ``bench``: references, then Kaikki, then ``--words`` rows."""
+    labelled = collect_labels(args.pos_source, reference_paths(args), exclude)
+    for word, _, pos in rows:
+        key = model_key(word)
+        if key not in exclude:
+            labelled.setdefault(key, pos)
+    return labelled
+
+
+def held_out(word: str, every: int) -> bool:
+    return zlib.crc32(model_key(word).encode("utf-8")) % every == 0
+
+
+def lookups_per_second(func: Callable[[str, str], object], rows: Sequence[Tuple[str, str, str]]) -> float:
+    repeat = max(1, MIN_BENCH_LOOKUPS // max(len(rows), 1))
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for word, english, _ in rows:
+            func(word, english)
+    elapsed = time.perf_counter() - started
+    return repeat * len(rows) / elapsed if elapsed else float("inf")
+
+
+def report(label: str, predictions: Sequence[str], gold: Sequence[str]) -> None:
+    answered = [(guess, truth) for guess, truth in zip(predictions, gold) if guess]
+    correct = sum(guess == truth for guess, truth in answered)
+    total = len(gold)
+    coverage = len(answered) / total if total else 0.0
+    precision = correct / len(answered) if answered else 0.0
+    accuracy = correct / total if total else 0.0
+    print(f"  {label:<28} coverage {coverage:6.1%}  precision {precision:6.1%}  accuracy {accuracy:6.1%}")
+
+
+def run_bench(args: argparse.Namespace) -> None:
+    rows = read_labelled_rows(args.words)
+    test = [row for row in rows if held_out(row[0], args.holdout_every)]
+    if not test:
+        sys.exit(f"No held-out rows in {args.words}.")
+    exclude = {model_key(word) for word, _, _ in test}
+
+    started = time.perf_counter()
+    labelled = training_labels(args, rows, exclude)
+    model = train(labelled, max_suffix=args.max_suffix, min_support=args.min_support)
+    train_seconds = time.perf_counter() - started
+
+    gold = [pos for _, _, pos in test]
+    print(f"Trained on {len(labelled)} words -> {len(model.entries)} suffixes ({train_seconds:.1f}s)")
+    print(f"Held out {len(test)} of {len(rows)} labelled rows in {args.words} (1 in {args.holdout_every})")
+    print()
+    print("Accuracy on held-out rows")
+    report("legacy heuristic_pos()", [heuristic_pos(word, english) for word, english, _ in test], gold)
+    lazy = LazySuffixModel.preloaded(model)
+    report(
+        f"heuristic_pos() + model@{MIN_SUFFIX_CONFIDENCE:g}",
+        [heuristic_pos(word, english, lazy) for word, english, _ in test],
+        gold,
+    )
+    predictions = [model.predict(word) for word, _, _ in test]
+    for threshold in THRESHOLDS:
+        report(
+            f"model alone, conf >= {threshold:g}",
+            [hit[0] if hit and hit[1] >= threshold else "" for hit in predictions],
+            gold,
+        )
+    print()
+    print("Throughput")
+    legacy_rate = lookups_per_second(heuristic_pos, test)
+    model_rate = lookups_per_second(lambda word, english: heuristic_pos(word, english, lazy), test)
+    print(f"  legacy heuristic_pos():      {legacy_rate:12,.0f} words/s")
+    print(f"  heuristic_pos() + model:     {model_rate:12,.0f} words/s")
+
+
+def run_train(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    rows = read_labelled_rows(args.words) if args.words.is_file() else []
+    labelled = training_labels(args, rows)
+    if not labelled:
+        sys.exit("No labelled words found; check --pos-source, --reference, and --words.")
+    model = train(labelled, max_suffix=args.max_suffix, min_support=args.min_support)
+    model.save(args.output, words=len(labelled), min_support=args.min_support)
+    elapsed = time.perf_counter() - started
+    print(f"Trained on {len(labelled)} words -> {len(model.entries)} suffixes in {elapsed:.1f}s")
+    print(f"Model: {args.output} ({args.output.stat().st_size} bytes)")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "train":
+        run_train(args)
+    else:
+        run_bench(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Memory-mapped, multi-process TSV parsing with csv.reader-compatible results."""
+from __future__ import annotations
+
+import csv
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Iterator, List, Optional, Sequence, Tuple
+
+
+# Files smaller than this are parsed in-process; pool start-up would dominate.
+PARALLEL_MIN_BYTES = 32 << 20
+CHUNK_BYTES = 8 << 20
+# Rows handed to ``transform`` at a time on the sequential path; small batches
+# keep few rows alive at once, which keeps the cyclic GC cheap.
+BATCH_ROWS = 1_000
+# Chunks in flight per worker, so results cannot pile up ahead of the consumer.
+PREFETCH_PER_WORKER = 2
+# Parsed rows cost far more than their text: short (word, row) pairs measure
+# about 18 bytes of Python objects per input byte. Used to size chunks under
+# a memory cap.
+PARSED_BYTES_PER_BYTE = 20
+MIN_CHUNK_BYTES = 1 << 20
+
+CSV_ONLY_RE = re.compile(rb'["\0]|\r(?!\n)')
+
+RowTransform = Callable[[List[List[str]]], Sequence[Any]]
+
+
+def needs_csv(buf: mmap.mmap) -> bool:
+    """True when plain tab/newline splitting could differ from ``csv.reader``.
+
+    Quotes start quoted fields, NUL makes csv raise, and a carriage return
+    that is not part of ``\\r\\n`` ends a record on its own.
+    """
+    return CSV_ONLY_RE.search(buf) is not None
+
+
+def split_rows(text: str) -> List[List[str]]:
+    """Split quote-free TSV text into rows exactly as ``csv.reader(dialect="excel-tab")`` would."""
+    lines = text.split("\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    rows: List[List[str]] = []
+    for line in lines:
+        if line.endswith("\r"):
+            line = line[:-1]
+        rows.append(line.split("\t") if line else [])
+    return rows
+
+
+def chunk_bounds(buf: mmap.mmap, size: int, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """Cut ``buf`` into ranges of about ``chunk_bytes`` that each end just after a newline."""
+    bounds: List[Tuple[int, int]] = []
+    start = 0
+    while start < size:
+        cut = buf.find(b"\n", min(start + chunk_bytes, size) - 1)
+        end = size if cut == -1 else cut + 1
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def parse_chunk(
+    path: str, start: int, end: int, errors: str, transform: Optional[RowTransform]
+) -> Sequence[Any]:
+    """Worker: decode and split one newline-aligned byte range of ``path``."""
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        text = buf[start:end].decode("utf-8", errors)
+    rows = split_rows(text)
+    return transform(rows) if transform is not None else rows
+
+
+def iter_csv_batches(path: Path, errors: str, transform: Optional[RowTransform]) -> Iterator[Sequence[Any]]:
+    with path.open("r", encoding="utf-8", errors=errors, newline="") as handle:
+        batch: List[List[str]] = []
+        for row in csv.reader(handle, dialect="excel-tab"):
+            batch.append(row)
+            if len(batch) >= BATCH_ROWS:
+                yield transform(batch) if transform is not None else batch
+                batch = []
+        if batch:
+            yield transform(batch) if transform is not None else batch
+
+
+def parallel_plan(workers: int, memory_cap: Optional[int]) -> Optional[Tuple[int, int]]:
+    """``(workers, chunk_bytes)`` whose in-flight results fit ``memory_cap``, or None to stay sequential.
+
+    The parent holds up to ``workers * PREFETCH_PER_WORKER`` finished chunks
+    plus the one being consumed; chunks shrink (down to MIN_CHUNK_BYTES) and
+    then workers are dropped until that fits.
+    """
+    if workers < 2:
+        return None
+    if memory_cap is None:
+        return workers, CHUNK_BYTES
+    allowed = memory_cap // PARSED_BYTES_PER_BYTE
+    chunk_bytes = min(CHUNK_BYTES, allowed // (workers * PREFETCH_PER_WORKER + 1))
+    if chunk_bytes < MIN_CHUNK_BYTES:
+        chunk_bytes = MIN_CHUNK_BYTES
+        workers = (allowed // MIN_CHUNK_BYTES - 1) // PREFETCH_PER_WORKER
+    return (workers, chunk_bytes) if workers >= 2 else None
+
+
+def map_tsv_rows(
+    path: Path,
+    transform: Optional[RowTransform] = None,
+    *,
+    errors: str = "strict",
+    workers: Optional[int] = None,
+    memory_cap: Optional[int] = None,
+) -> Iterator[Any]:
+    """Yield one item per TSV row (header included), in file order.
+
+    ``transform`` receives a list of parsed rows and must return one result per
+    row; without it the rows themselves are yielded. Large files are memory-
+    mapped, cut at newline boundaries, and parsed (and transformed) in a
+    process pool, so ``transform`` must be a picklable module-level function
+    or ``functools.partial`` of one. Files containing quotes, NUL bytes, or bare
+    carriage returns, small files, and single-CPU machines go through
+    ``csv.reader`` in-process instead; both paths give the same rows.
+
+    ``memory_cap`` bounds the parsed results buffered in this process: chunk
+    size and worker count are reduced to fit, and below what two workers
+    need the sequential reader (BATCH_ROWS rows at a time) is used.
+    """
+    plan = parallel_plan(workers or os.cpu_count() or 1, memory_cap)
+    size = path.stat().st_size
+    if size == 0:
+        return
+    if plan is not None and size >= PARALLEL_MIN_BYTES:
+        workers, chunk_bytes = plan
+        with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            bounds = None if needs_csv(buf) else chunk_bounds(buf, size, chunk_bytes)
+        if bounds is not None:
+            yield from map_chunks(path, bounds, errors, transform, workers)
+            return
+    for batch in iter_csv_batches(path, errors, transform):
+        yield from batch
+
+
+def map_chunks(
+    path: Path,
+    bounds: Sequence[Tuple[int, int]],
+    errors: str,
+    transform: Optional[RowTransform],
+    workers: int,
+) -> Iterator[Any]:
+    pending: Deque[Future] = deque()
+    remaining = iter(bounds)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+
+        def submit_next() -> None:
+            span = next(remaining, None)
+            if span is not None:
+                pending.append(pool.submit(parse_chunk, str(path), span[0], span[1], errors, transform))
+
+        for _ in range(workers * PREFETCH_PER_WORKER):
+            submit_next()
+        while pending:
+            result = pending.popleft().result()
+            submit_next()
+            yield from result
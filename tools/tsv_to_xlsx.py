@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import re
 import shutil
 import sys
@@ -14,6 +13,8 @@ from typing import Iterable, List
 from xml.sax.saxutils import escape
 import xml.etree.ElementTree as ET
 
+from tsv_reader import map_tsv_rows
+
 
 SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
 REL_DOC_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
@@ -87,9 +88,7 @@ def build_sheet_xml(rows: Iterable[List[str]]) -> str:
 
 
 def load_tsv(tsv_path: Path) -> List[List[str]]:
-    with tsv_path.open("r", encoding="utf-8", newline="") as handle:
-        reader = csv.reader(handle, delimiter="\t")
-        return [row for row in reader]
+    return list(map_tsv_rows(tsv_path))
 
 
 def parse_args() -> argparse.Namespace:
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Import vocab TSVs and lookup resources into an indexed SQLite database (and export them back)."""
+from __future__ import annotations
+
+import argparse
+import csv
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from compare_vocab import sanitize_word
+from enrich_missing_vocab import (
+    CEFR_CODES,
+    MERGE_STRATEGIES,
+    POS_CODES,
+    load_frequency_map,
+    load_pos_lookup,
+    merge_reference_files,
+    strip_accents,
+)
+
+
+DEFAULT_DB = Path("data") / "vocab.sqlite"
+SCHEMA_VERSION = "2"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL,
+    definition TEXT NOT NULL,
+    pos TEXT NOT NULL,
+    cefr TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    accentless TEXT NOT NULL,
+    raw TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS words_normalized ON words (normalized);
+CREATE INDEX IF NOT EXISTS words_accentless ON words (accentless);
+CREATE TABLE IF NOT EXISTS reference (
+    normalized TEXT PRIMARY KEY,
+    accentless TEXT NOT NULL,
+    spanish TEXT NOT NULL,
+    pos TEXT NOT NULL,
+    cefr TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    pos_source TEXT NOT NULL,
+    cefr_source TEXT NOT NULL,
+    tags_source TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reference_accentless ON reference (accentless);
+CREATE TABLE IF NOT EXISTS frequency (
+    normalized TEXT PRIMARY KEY,
+    accentless TEXT NOT NULL,
+    rank INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS frequency_accentless ON frequency (accentless);
+CREATE TABLE IF NOT EXISTS pos_exact (
+    normalized TEXT PRIMARY KEY,
+    pos TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pos_accentless (
+    accentless TEXT PRIMARY KEY,
+    pos TEXT NOT NULL
+);
+"""
+
+WORD_COLUMNS = ("word", "definition", "pos", "cefr", "tags")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Maintain an indexed SQLite copy of words.tsv and the enrichment resources."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import", help="Load TSV/lookup files into the database (each table is replaced)."
+    )
+    import_parser.add_argument(
+        "--db", type=Path, default=DEFAULT_DB, help=f"SQLite database path (default: {DEFAULT_DB})."
+    )
+    import_parser.add_argument("--words", type=Path, help="Canonical words.tsv to import.")
+    import_parser.add_argument(
+        "--reference",
+        type=Path,
+        action="append",
+        help="Reference TSV(s) mined for CEFR/POS/tags (repeatable, in priority order).",
+    )
+    import_parser.add_argument(
+        "--merge-strategy",
+        choices=MERGE_STRATEGIES,
+        default="priority",
+        help="Conflict resolution across reference files (see enrich_missing_vocab.py).",
+    )
+    import_parser.add_argument("--frequency", type=Path, help="HermitDave frequency list to import.")
+    import_parser.add_argument(
+        "--pos-source", type=Path, help="Kaikki/Wiktionary dump (es-extract.jsonl.gz) to import."
+    )
+
+    export_parser = subparsers.add_parser(
+        "export", help="Write the stored words table back out as TSV (byte-for-byte)."
+    )
+    export_parser.add_argument(
+        "--db", type=Path, default=DEFAULT_DB, help=f"SQLite database path (default: {DEFAULT_DB})."
+    )
+    export_parser.add_argument("--output", type=Path, required=True, help="Destination TSV path.")
+    return parser.parse_args()
+
+
+def connect(path: Path, *, create: bool = False) -> sqlite3.Connection:
+    """Open ``path`` read-only, or read-write with ``create=True`` (creating and stamping the schema).
+
+    Exits when the file is not a vocab database or carries a different schema version.
+    """
+    if not create and not path.is_file():
+        sys.exit(f"Database not found: {path}")
+    if create:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+    else:
+        conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        has_meta = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta'"
+        ).fetchone()
+        version = get_meta(conn, "schema_version") if has_meta else None
+    except sqlite3.DatabaseError as exc:
+        conn.close()
+        sys.exit(f"Cannot open {path}: {exc}")
+    if version is None and not create:
+        conn.close()
+        sys.exit(f"{path} is not a vocab database (no schema_version); build it with vocab_db.py import.")
+    if version is not None and version != SCHEMA_VERSION:
+        conn.close()
+        sys.exit(f"{path} has schema version {version}; this tool expects {SCHEMA_VERSION}. Rebuild it.")
+    if create:
+        conn.executescript(SCHEMA)
+        set_meta(conn, "schema_version", SCHEMA_VERSION)
+        conn.commit()
+    return conn
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def get_meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def iter_raw_records(path: Path) -> Iterator[Tuple[List[str], str]]:
+    """Yield ``(fields, raw_text)`` pairs where ``raw_text`` is the exact source text of the record."""
+    consumed: List[str] = []
+
+    def feed(handle: Iterable[str]) -> Iterator[str]:
+        for line in handle:
+            consumed.append(line)
+            yield line
+
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        for fields in csv.reader(feed(handle), dialect="excel-tab"):
+            raw = "".join(consumed)
+            consumed.clear()
+            yield fields, raw
+
+
+def import_words(conn: sqlite3.Connection, path: Path) -> int:
+    conn.execute("DELETE FROM words")
+    records = iter_raw_records(path)
+    header = next(records, None)
+    if header is None:
+        sys.exit(f"Empty TSV: {path}")
+    header_fields, header_raw = header
+    lowered = [field.strip().lstrip("\ufeff").lower() for field in header_fields]
+    indices = {name: lowered.index(name) if name in lowered else None for name in WORD_COLUMNS}
+    if indices["word"] is None:
+        indices["word"] = 0
+
+    def column(row: Sequence[str], name: str) -> str:
+        idx = indices[name]
+        return row[idx] if idx is not None and idx < len(row) else ""
+
+    def rows() -> Iterator[Tuple[str, ...]]:
+        for fields, raw in records:
+            word = column(fields, "word")
+            yield (
+                word,
+                column(fields, "definition"),
+                column(fields, "pos"),
+                column(fields, "cefr"),
+                column(fields, "tags"),
+                sanitize_word(word, ignore_accents=False, strip_punct=True),
+                sanitize_word(word, ignore_accents=True, strip_punct=True),
+                raw,
+            )
+
+    conn.executemany(
+        "INSERT INTO words (word, definition, pos, cefr, tags, normalized, accentless, raw) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows(),
+    )
+    set_meta(conn, "words_header_raw", header_raw)
+    set_meta(conn, "words_source", str(path))
+    return conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+
+def import_reference(conn: sqlite3.Connection, paths: Sequence[Path], strategy: str) -> int:
+    merge = merge_reference_files(paths, strategy)
+    source_names = [str(path) for path in merge.sources]
+
+    def source(idx: int) -> str:
+        return source_names[idx] if idx >= 0 else ""
+
+    conn.execute("DELETE FROM reference")
+    conn.executemany(
+        "INSERT INTO reference (normalized, accentless, spanish, pos, cefr, tags, "
+        "pos_source, cefr_source, tags_source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                key,
+                strip_accents(key),
+                entry.spanish,
+                POS_CODES.decode(entry.pos),
+                CEFR_CODES.decode(entry.cefr),
+                entry.tags,
+                *(source(idx) for idx in merge.provenance[key]),
+            )
+            for key, entry in merge.entries.items()
+        ),
+    )
+    set_meta(conn, "reference_sources", "\n".join(str(path) for path in paths))
+    return len(merge.entries)
+
+
+def import_frequency(conn: sqlite3.Connection, path: Path) -> int:
+    freq_map = load_frequency_map(path)
+    conn.execute("DELETE FROM frequency")
+    conn.executemany(
+        "INSERT INTO frequency (normalized, accentless, rank) VALUES (?, ?, ?)",
+        ((key, strip_accents(key), rank) for key, rank in freq_map.items()),
+    )
+    set_meta(conn, "frequency_source", str(path))
+    return len(freq_map)
+
+
+def import_pos_lookup(conn: sqlite3.Connection, path: Path) -> int:
+    lookup = load_pos_lookup(path)
+    conn.execute("DELETE FROM pos_exact")
+    conn.execute("DELETE FROM pos_accentless")
+    conn.executemany(
+        "INSERT INTO pos_exact (normalized, pos) VALUES (?, ?)",
+        ((key, POS_CODES.decode(code)) for key, code in lookup.exact.items()),
+    )
+    conn.executemany(
+        "INSERT INTO pos_accentless (accentless, pos) VALUES (?, ?)",
+        ((key, POS_CODES.decode(code)) for key, code in lookup.accentless.items()),
+    )
+    set_meta(conn, "pos_source", str(path))
+    return len(lookup.exact)
+
+
+def require_words(conn: sqlite3.Connection) -> str:
+    """Raw header line of the imported words TSV; exits when ``--words`` was never imported."""
+    header_raw = get_meta(conn, "words_header_raw")
+    if header_raw is None:
+        sys.exit("Database has no words table imported.")
+    return header_raw
+
+
+def export_words(conn: sqlite3.Connection, path: Path) -> int:
+    header_raw = require_words(conn)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        handle.write(header_raw)
+        for (raw,) in conn.execute("SELECT raw FROM words ORDER BY id"):
+            handle.write(raw)
+            count += 1
+    return count
+
+
+def load_probe_keys(conn: sqlite3.Connection, keys: Iterable[str]) -> None:
+    """Fill the temporary ``probe`` table used for set joins against the indexed tables."""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS probe (key TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM probe")
+    conn.executemany("INSERT OR IGNORE INTO probe (key) VALUES (?)", ((key,) for key in keys))
+
+
+def present_words(conn: sqlite3.Connection, keys: Iterable[str], *, ignore_accents: bool) -> set[str]:
+    """Return the subset of ``keys`` that exist in the words table (one indexed join)."""
+    column = "accentless" if ignore_accents else "normalized"
+    load_probe_keys(conn, keys)
+    query = f"SELECT probe.key FROM probe WHERE EXISTS (SELECT 1 FROM words WHERE words.{column} = probe.key)"
+    return {key for (key,) in conn.execute(query)}
+
+
+def word_counts(conn: sqlite3.Connection, *, ignore_accents: bool) -> Tuple[int, int, int]:
+    """Return ``(rows, unique, malformed)`` counts for the stored words table."""
+    column = "accentless" if ignore_accents else "normalized"
+    rows = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+    malformed = conn.execute(f"SELECT COUNT(*) FROM words WHERE {column} = ''").fetchone()[0]
+    unique = conn.execute(f"SELECT COUNT(DISTINCT {column}) FROM words WHERE {column} != ''").fetchone()[0]
+    return rows, unique, malformed
+
+
+def fetch_reference(conn: sqlite3.Connection, keys: Iterable[str]) -> Dict[str, Tuple[str, str, str, str]]:
+    load_probe_keys(conn, keys)
+    query = (
+        "SELECT r.normalized, r.spanish, r.pos, r.cefr, r.tags "
+        "FROM probe JOIN reference AS r ON r.normalized = probe.key"
+    )
+    return {key: (spanish, pos, cefr, tags) for key, spanish, pos, cefr, tags in conn.execute(query)}
+
+
+def fetch_frequency(conn: sqlite3.Connection, keys: Iterable[str]) -> Dict[str, int]:
+    load_probe_keys(conn, keys)
+    query = "SELECT f.normalized, f.rank FROM probe JOIN frequency AS f ON f.normalized = probe.key"
+    return dict(conn.execute(query))
+
+
+def fetch_pos_lookup(
+    conn: sqlite3.Connection, keys: Iterable[str], accentless_keys: Iterable[str]
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    load_probe_keys(conn, keys)
+    exact = dict(
+        conn.execute("SELECT p.normalized, p.pos FROM probe JOIN pos_exact AS p ON p.normalized = probe.key")
+    )
+    load_probe_keys(conn, accentless_keys)
+    accentless = dict(
+        conn.execute(
+            "SELECT p.accentless, p.pos FROM probe JOIN pos_accentless AS p ON p.accentless = probe.key"
+        )
+    )
+    return exact, accentless
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "import":
+        if not any([args.words, args.reference, args.frequency, args.pos_source]):
+            sys.exit("Nothing to import: pass --words, --reference, --frequency and/or --pos-source.")
+        with connect(args.db, create=True) as conn:
+            if args.words:
+                if not args.words.is_file():
+                    sys.exit(f"File not found: {args.words}")
+                print(f"words:      {import_words(conn, args.words)} rows")
+            if args.reference:
+                print(f"reference:  {import_reference(conn, args.reference, args.merge_strategy)} entries")
+            if args.frequency:
+                print(f"frequency:  {import_frequency(conn, args.frequency)} ranks")
+            if args.pos_source:
+                print(f"pos lookup: {import_pos_lookup(conn, args.pos_source)} entries")
+        conn.close()
+        print(f"Database:   {args.db}")
+    else:
+        conn = connect(args.db)
+        count = export_words(conn, args.output)
+        conn.close()
+        print(f"Wrote {count} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Compute and apply compact deltas between two revisions of a vocab TSV."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, List, Sequence, Tuple, Union
+
+from compare_vocab import sanitize_word
+from vocab_db import iter_raw_records
+
+
+DELTA_VERSION = 1
+
+# An op is either ``[start, count]`` (copy base records start..start+count-1)
+# or a string (insert this raw record text verbatim).
+Op = Union[List[int], str]
+
+
+@dataclass
+class TsvRevision:
+    header: str
+    records: List[str]
+    keys: List[str]
+    sha256: str
+
+
+@dataclass
+class DeltaSummary:
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Diff two revisions of words.tsv into a compact delta, or apply a chain of deltas."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    diff_parser = subparsers.add_parser("diff", help="Write the delta that turns --base into --target.")
+    diff_parser.add_argument("--base", type=Path, required=True, help="Previous revision of the TSV.")
+    diff_parser.add_argument("--target", type=Path, required=True, help="New revision of the TSV.")
+    diff_parser.add_argument("--output", type=Path, required=True, help="Destination delta (.json).")
+    diff_parser.add_argument(
+        "--list",
+        action="store_true",
+        help="Print the added/removed/changed words, not just the counts.",
+    )
+
+    apply_parser = subparsers.add_parser("apply", help="Apply one or more deltas to a base TSV.")
+    apply_parser.add_argument("--base", type=Path, required=True, help="TSV revision the first delta was made from.")
+    apply_parser.add_argument(
+        "--delta",
+        type=Path,
+        action="append",
+        required=True,
+        help="Delta file to apply (repeatable, applied in order).",
+    )
+    apply_parser.add_argument("--output", type=Path, required=True, help="Destination TSV.")
+    return parser.parse_args()
+
+
+def sha256_text(header: str, records: Sequence[str]) -> str:
+    digest = hashlib.sha256(header.encode("utf-8"))
+    for record in records:
+        digest.update(record.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def record_key(fields: Sequence[str], raw: str) -> str:
+    """Normalized word used to pair rows across revisions; blank rows pair by their raw text."""
+    normalized = sanitize_word(fields[0], ignore_accents=False, strip_punct=True) if fields else ""
+    return normalized or "\0" + raw
+
+
+def read_revision(path: Path) -> TsvRevision:
+    try:
+        records = iter_raw_records(path)
+        first = next(records, None)
+        header = first[1] if first else ""
+        raws: List[str] = []
+        keys: List[str] = []
+        for fields, raw in records:
+            raws.append(raw)
+            keys.append(record_key(fields, raw))
+    except FileNotFoundError:
+        sys.exit(f"File not found: {path}")
+    return TsvRevision(header=header, records=raws, keys=keys, sha256=sha256_text(header, raws))
+
+
+def compute_delta(base: TsvRevision, target: TsvRevision) -> Tuple[Dict[str, object], DeltaSummary]:
+    """Pair rows by key in one pass over each revision and emit ordered copy/insert ops."""
+    positions: Dict[str, Deque[int]] = {}
+    for idx, key in enumerate(base.keys):
+        positions.setdefault(key, deque()).append(idx)
+
+    summary = DeltaSummary()
+    ops: List[Op] = []
+    for raw, key in zip(target.records, target.keys):
+        queue = positions.get(key)
+        base_idx = queue.popleft() if queue else None
+        if base_idx is not None and base.records[base_idx] == raw:
+            summary.unchanged += 1
+            last = ops[-1] if ops else None
+            if isinstance(last, list) and last[0] + last[1] == base_idx:
+                last[1] += 1
+            else:
+                ops.append([base_idx, 1])
+            continue
+        if base_idx is None:
+            summary.added.append(key)
+        else:
+            summary.changed.append(key)
+        ops.append(raw)
+    for key, queue in positions.items():
+        summary.removed.extend(key for _ in queue)
+
+    delta = {
+        "version": DELTA_VERSION,
+        "base_sha256": base.sha256,
+        "target_sha256": target.sha256,
+        "header": target.header if target.header != base.header else None,
+        "counts": {
+            "added": len(summary.added),
+            "removed": len(summary.removed),
+            "changed": len(summary.changed),
+            "unchanged": summary.unchanged,
+        },
+        "ops": ops,
+    }
+    return delta, summary
+
+
+def apply_delta(header: str, records: List[str], delta: Dict[str, object]) -> Tuple[str, List[str]]:
+    if delta.get("version") != DELTA_VERSION:
+        raise ValueError(f"Unsupported delta version: {delta.get('version')}")
+    if sha256_text(header, records) != delta["base_sha256"]:
+        raise ValueError("Delta does not apply: base revision hash mismatch.")
+    new_header = delta["header"] if delta["header"] is not None else header
+    new_records: List[str] = []
+    for op in delta["ops"]:  # type: ignore[union-attr]
+        if isinstance(op, str):
+            new_records.append(op)
+        else:
+            start, count = op
+            new_records.extend(records[start : start + count])
+    if sha256_text(new_header, new_records) != delta["target_sha256"]:
+        raise ValueError("Delta produced unexpected output: target revision hash mismatch.")
+    return new_header, new_records
+
+
+def write_revision(path: Path, header: str, records: Sequence[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        handle.write(header)
+        handle.writelines(records)
+
+
+def display_key(key: str) -> str:
+    return "(blank row)" if key.startswith("\0") else key
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "diff":
+        base = read_revision(args.base)
+        target = read_revision(args.target)
+        delta, summary = compute_delta(base, target)
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with args.output.open("w", encoding="utf-8") as handle:
+            json.dump(delta, handle, ensure_ascii=False, separators=(",", ":"))
+        print(f"Added:     {len(summary.added)}")
+        print(f"Removed:   {len(summary.removed)}")
+        print(f"Changed:   {len(summary.changed)}")
+        print(f"Unchanged: {summary.unchanged}")
+        if args.list:
+            for label, keys in (("+", summary.added), ("-", summary.removed), ("~", summary.changed)):
+                for key in keys:
+                    print(f"  {label} {display_key(key)}")
+        print(f"Delta file: {args.output}")
+    else:
+        base = read_revision(args.base)
+        header, records = base.header, base.records
+        for delta_path in args.delta:
+            with delta_path.open("r", encoding="utf-8") as handle:
+                delta = json.load(handle)
+            try:
+                header, records = apply_delta(header, records, delta)
+            except ValueError as exc:
+                sys.exit(f"{delta_path}: {exc}")
+        write_revision(args.output, header, records)
+        print(f"Applied {len(args.delta)} delta(s); wrote {len(records)} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Shared row readers for the vocab tools (TSV files, XLSX sheets, sharded datasets)."""
+from __future__ import annotations
+
+import json
+import zipfile
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from tsv_reader import BATCH_ROWS, RowTransform, map_tsv_rows
+from xlsx_reader import iter_xlsx_rows
+
+
+SHARD_MANIFEST_SUFFIX = ".shards.json"
+XLSX_SUFFIX = ".xlsx"
+
+
+def is_shard_manifest(path: Path) -> bool:
+    return path.name.endswith(SHARD_MANIFEST_SUFFIX)
+
+
+def resolve_shard_manifest(path: Path) -> Path | None:
+    """Return the shard manifest for ``path`` (a manifest or a directory holding one), if any."""
+    if path.is_dir():
+        manifests = sorted(path.glob(f"*{SHARD_MANIFEST_SUFFIX}"))
+        if len(manifests) != 1:
+            raise FileNotFoundError(f"Expected one *{SHARD_MANIFEST_SUFFIX} manifest in {path}")
+        return manifests[0]
+    if is_shard_manifest(path):
+        return path
+    return None
+
+
+def shard_paths(manifest_path: Path) -> List[Path]:
+    with manifest_path.open("r", encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    return [manifest_path.parent / shard["file"] for shard in manifest["shards"]]
+
+
+def split_xlsx_sheet(path: Path) -> Tuple[Path, Optional[str]]:
+    """Split ``book.xlsx#Sheet`` into the workbook path and sheet name."""
+    text = str(path)
+    marker = text.lower().find(XLSX_SUFFIX + "#")
+    if marker == -1:
+        return path, None
+    cut = marker + len(XLSX_SUFFIX)
+    return Path(text[:cut]), text[cut + 1 :] or None
+
+
+def is_xlsx(path: Path) -> bool:
+    return split_xlsx_sheet(path)[0].suffix.lower() == XLSX_SUFFIX
+
+
+def source_exists(path: Path) -> bool:
+    return split_xlsx_sheet(path)[0].exists()
+
+
+def source_signature(path: Path) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+    """``(name, size, mtime_ns)`` of every file behind ``path``, or None if one is missing.
+
+    Covers the workbook of an XLSX path and the manifest plus every shard of a
+    sharded dataset, so a change to any of them changes the signature.
+    """
+    try:
+        manifest = None if is_xlsx(path) else resolve_shard_manifest(path)
+        files = [split_xlsx_sheet(path)[0]] if manifest is None else [manifest] + shard_paths(manifest)
+        stats = [(str(file), file.stat()) for file in files]
+    except (OSError, ValueError, KeyError):
+        return None
+    return tuple((name, stat.st_size, stat.st_mtime_ns) for name, stat in stats)
+
+
+def iter_table_rows(path: Path, *, errors: str = "strict") -> Iterator[List[str]]:
+    """Yield rows (header first) from a TSV, an XLSX sheet, or a sharded dataset.
+
+    ``book.xlsx`` reads the first worksheet and ``book.xlsx#Sheet`` a named
+    one. For a sharded dataset (a ``*.shards.json`` manifest or a directory
+    that contains one) the header of the first shard is yielded once and each
+    shard's own header is skipped, so callers see one logical table.
+    """
+    return map_table_rows(path, errors=errors)
+
+
+def map_table_rows(
+    path: Path,
+    transform: Optional[RowTransform] = None,
+    *,
+    errors: str = "strict",
+    memory_cap: Optional[int] = None,
+) -> Iterator[Any]:
+    """Like iter_table_rows(), but yield ``transform``'s per-row results.
+
+    TSV files (including shards) go through tsv_reader.map_tsv_rows(), so
+    large inputs are parsed and transformed in worker processes; XLSX sheets
+    are transformed in-process in batches. ``memory_cap`` is passed on to
+    map_tsv_rows() to bound the parsed rows buffered at once.
+    """
+    if is_xlsx(path):
+        workbook, sheet = split_xlsx_sheet(path)
+        if not workbook.is_file():
+            raise FileNotFoundError(workbook)
+        try:
+            yield from batched(iter_xlsx_rows(workbook, sheet), transform)
+        except (zipfile.BadZipFile, KeyError) as exc:
+            raise ValueError(f"not a readable XLSX workbook ({exc})") from exc
+        return
+
+    manifest = resolve_shard_manifest(path)
+    if manifest is None:
+        yield from map_tsv_rows(path, transform, errors=errors, memory_cap=memory_cap)
+        return
+
+    for idx, shard in enumerate(shard_paths(manifest)):
+        items = map_tsv_rows(shard, transform, errors=errors, memory_cap=memory_cap)
+        header = next(items, None)
+        if idx == 0 and header is not None:
+            yield header
+        yield from items
+
+
+def batched(rows: Iterable[List[str]], transform: Optional[RowTransform]) -> Iterator[Any]:
+    if transform is None:
+        yield from rows
+        return
+    batch: List[List[str]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_ROWS:
+            yield from transform(batch)
+            batch = []
+    if batch:
+        yield from transform(batch)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Stream rows out of an XLSX worksheet (the read-side counterpart of tsv_to_xlsx.py)."""
+from __future__ import annotations
+
+import argparse
+import csv
+import posixpath
+import re
+import sys
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Optional
+import xml.etree.ElementTree as ET
+
+from tsv_to_xlsx import REL_DOC_NS, REL_PKG_NS, SPREADSHEET_NS
+
+
+CELL_REF_RE = re.compile(r"^([A-Z]+)(\d*)$")
+SHARED_STRINGS_PART = "xl/sharedStrings.xml"
+
+TAG_SI = f"{{{SPREADSHEET_NS}}}si"
+TAG_T = f"{{{SPREADSHEET_NS}}}t"
+TAG_R = f"{{{SPREADSHEET_NS}}}r"
+TAG_IS = f"{{{SPREADSHEET_NS}}}is"
+TAG_V = f"{{{SPREADSHEET_NS}}}v"
+TAG_C = f"{{{SPREADSHEET_NS}}}c"
+TAG_ROW = f"{{{SPREADSHEET_NS}}}row"
+TAG_SHEET_DATA = f"{{{SPREADSHEET_NS}}}sheetData"
+
+
+def column_index(letters: str) -> int:
+    """Convert Excel column letters to a zero-based index (inverse of column_letter())."""
+    idx = 0
+    for ch in letters:
+        idx = idx * 26 + (ord(ch) - 64)
+    return idx - 1
+
+
+def rich_text(elem: ET.Element) -> str:
+    """Text of an ``<si>``/``<is>`` element: a plain ``<t>`` or the ``<t>`` of each ``<r>`` run."""
+    direct = elem.find(TAG_T)
+    if direct is not None:
+        return direct.text or ""
+    return "".join(run.findtext(TAG_T) or "" for run in elem.iter(TAG_R))
+
+
+def load_shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    if SHARED_STRINGS_PART not in zf.namelist():
+        return []
+    strings: List[str] = []
+    with zf.open(SHARED_STRINGS_PART) as handle:
+        for _, elem in ET.iterparse(handle, events=("end",)):
+            if elem.tag == TAG_SI:
+                strings.append(rich_text(elem))
+                elem.clear()
+    return strings
+
+
+def resolve_sheet_part(zf: zipfile.ZipFile, sheet: Optional[str]) -> str:
+    """Return the zip member holding ``sheet`` (or the first worksheet)."""
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {
+        rel.get("Id"): rel.get("Target", "")
+        for rel in rels.findall(f"{{{REL_PKG_NS}}}Relationship")
+    }
+    sheets = workbook.findall(f"{{{SPREADSHEET_NS}}}sheets/{{{SPREADSHEET_NS}}}sheet")
+    if not sheets:
+        raise ValueError("Workbook has no worksheets.")
+    if sheet is None:
+        chosen = sheets[0]
+    else:
+        matches = [elem for elem in sheets if elem.get("name") == sheet]
+        if not matches:
+            names = ", ".join(elem.get("name", "") for elem in sheets)
+            raise ValueError(f"Worksheet '{sheet}' not found (available: {names})")
+        chosen = matches[0]
+    target = targets.get(chosen.get(f"{{{REL_DOC_NS}}}id"), "")
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join("xl", target))
+
+
+def cell_value(cell: ET.Element, shared: List[str]) -> str:
+    kind = cell.get("t")
+    if kind == "inlineStr":
+        inline = cell.find(TAG_IS)
+        return rich_text(inline) if inline is not None else ""
+    raw = cell.findtext(TAG_V)
+    if raw is None:
+        return ""
+    if kind == "s":
+        return shared[int(raw)]
+    if kind == "b":
+        return "TRUE" if raw == "1" else "FALSE"
+    return raw
+
+
+def iter_xlsx_rows(path: Path, sheet: Optional[str] = None) -> Iterator[List[str]]:
+    """Yield each worksheet row as a list of strings, streaming the sheet XML.
+
+    Rows are parsed with ``iterparse`` and cleared as soon as they are yielded,
+    so memory stays flat apart from the shared-strings table. Missing cells are
+    filled with ``""`` and skipped row numbers come back as empty rows, the same
+    shape ``csv.reader`` gives for blank TSV lines.
+    """
+    with zipfile.ZipFile(path) as zf:
+        shared = load_shared_strings(zf)
+        part = resolve_sheet_part(zf, sheet)
+        with zf.open(part) as handle:
+            next_row = 1
+            sheet_data: Optional[ET.Element] = None
+            cells: List[str] = []
+            for event, elem in ET.iterparse(handle, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == TAG_SHEET_DATA:
+                        sheet_data = elem
+                    elif elem.tag == TAG_ROW:
+                        cells = []
+                    continue
+                if elem.tag == TAG_C:
+                    match = CELL_REF_RE.match(elem.get("r", ""))
+                    position = column_index(match.group(1)) if match else len(cells)
+                    if position > len(cells):
+                        cells.extend([""] * (position - len(cells)))
+                    cells.append(cell_value(elem, shared))
+                elif elem.tag == TAG_ROW:
+                    row_number = int(elem.get("r") or next_row)
+                    while next_row < row_number:
+                        yield []
+                        next_row += 1
+                    yield cells
+                    next_row = row_number + 1
+                    elem.clear()
+                    if sheet_data is not None:
+                        sheet_data.clear()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Convert an XLSX worksheet into a TSV file.")
+    parser.add_argument("xlsx_path", type=Path, help="Workbook to read.")
+    parser.add_argument("--sheet", help="Worksheet name (defaults to the first sheet).")
+    parser.add_argument(
+        "--tsv",
+        type=Path,
+        help="Output TSV path (defaults to xlsx_path with .tsv).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.xlsx_path.is_file():
+        sys.exit(f"XLSX file not found: {args.xlsx_path}")
+    tsv_path = args.tsv or args.xlsx_path.with_suffix(".tsv")
+    count = 0
+    try:
+        with tsv_path.open("w", encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle, delimiter="\t")
+            for row in iter_xlsx_rows(args.xlsx_path, args.sheet):
+                writer.writerow(row)
+                count += 1
+    except (ValueError, KeyError, zipfile.BadZipFile) as exc:
+        sys.exit(f"Cannot read {args.xlsx_path}: {exc}")
+    print(f"Wrote {count} rows to {tsv_path}")
+
+
+if __name__ == "__main__":
+    main()